@@ -1,4 +1,6 @@
 import ssl
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Type
 from urllib.parse import parse_qs, unquote, urlparse
 
@@ -9,7 +11,100 @@ from asynch.proto.connection import Connection as ProtoConnection
 from asynch.proto.utils.compat import asbool
 
 
+def _parse_compression(value: str):
+    value = value.lower()
+    if value in ("lz4", "lz4hc", "zstd"):
+        return value
+    return asbool(value)
+
+
+def _parse_ssl_version(value: str):
+    return getattr(ssl, value)
+
+
+# Connection kwargs accepted in DSN query, other keys are settings.
+_dsn_query_parsers = {
+    "compression": _parse_compression,
+    "secure": asbool,
+    "client_name": str,
+    "connect_timeout": float,
+    "send_receive_timeout": float,
+    "sync_request_timeout": float,
+    "ping_interval": float,
+    "compress_block_size": int,
+    "send_buffer_size": int,
+    "tcp_nodelay": asbool,
+    # ssl
+    "verify": asbool,
+    "ssl_version": _parse_ssl_version,
+    "ca_certs": str,
+    "ciphers": str,
+    "alt_hosts": str,
+}
+
+
+@lru_cache(maxsize=32)
+def _parse_dsn(url: str):
+    """
+    Parses DSN into read-only connection kwargs. Results are cached, pools
+    parse the same DSN for every new connection.
+    """
+    url = urlparse(url)
+
+    settings = {}
+    kwargs = {}
+
+    if url.hostname is not None:
+        kwargs["host"] = unquote(url.hostname)
+
+    if url.port is not None:
+        kwargs["port"] = url.port
+
+    path = url.path.replace("/", "", 1)
+    if path:
+        kwargs["database"] = path
+
+    if url.username is not None:
+        kwargs["user"] = unquote(url.username)
+
+    if url.password is not None:
+        kwargs["password"] = unquote(url.password)
+
+    if url.scheme == "clickhouses":
+        kwargs["secure"] = True
+
+    for name, value in parse_qs(url.query).items():
+        if not value or not len(value):
+            continue
+
+        parse_value = _dsn_query_parsers.get(name)
+        if parse_value is None:
+            settings[name] = value[0]
+        else:
+            kwargs[name] = parse_value(value[0])
+
+    if settings:
+        kwargs["settings"] = settings
+
+    return MappingProxyType(kwargs)
+
+
 class Connection:
+    __slots__ = (
+        "_dsn",
+        "_user",
+        "_password",
+        "_host",
+        "_port",
+        "_database",
+        "_connection_kwargs",
+        "_is_closed",
+        "_echo",
+        "_cursor_cls",
+        "_connected",
+        "_connection",
+    )
+
     def __init__(
         self,
         dsn: str = None,
@@ -118,72 +213,15 @@ class Connection:
         Any additional querystring arguments will be passed along to
         the Connection class's initializer.
         """
-        url = urlparse(url)
-
-        settings = {}
-        kwargs = {}
-
-        if url.hostname is not None:
-            self._host = kwargs["host"] = unquote(url.hostname)
-
-        if url.port is not None:
-            self._port = kwargs["port"] = url.port
-
-        path = url.path.replace("/", "", 1)
-        if path:
-            self._database = kwargs["database"] = path
-
-        if url.username is not None:
-            self._user = kwargs["user"] = unquote(url.username)
-
-        if url.password is not None:
-            self._password = kwargs["password"] = unquote(url.password)
-
-        if url.scheme == "clickhouses":
-            kwargs["secure"] = True
-
-        compression_algs = {"lz4", "lz4hc", "zstd"}
-        timeouts = {"connect_timeout", "send_receive_timeout", "sync_request_timeout"}
-
-        for name, value in parse_qs(url.query).items():
-            if not value or not len(value):
-                continue
-
-            value = value[0]
-
-            if name == "compression":
-                value = value.lower()
-                if value in compression_algs:
-                    kwargs[name] = value
-                else:
-                    kwargs[name] = asbool(value)
-
-            elif name == "secure":
-                kwargs[name] = asbool(value)
-
-            elif name == "client_name":
-                kwargs[name] = value
-
-            elif name in timeouts:
-                kwargs[name] = float(value)
-
-            elif name == "compress_block_size":
-                kwargs[name] = int(value)
-
-            # ssl
-            elif name == "verify":
-                kwargs[name] = asbool(value)
-            elif name == "ssl_version":
-                kwargs[name] = getattr(ssl, value)
-            elif name in ["ca_certs", "ciphers"]:
-                kwargs[name] = value
-            elif name == "alt_hosts":
-                kwargs["alt_hosts"] = value
-            else:
-                settings[name] = value
-
-        if settings:
-            kwargs["settings"] = settings
+        kwargs = dict(_parse_dsn(url))
+        if "settings" in kwargs:
+            kwargs["settings"] = dict(kwargs["settings"])
+
+        self._host = kwargs.get("host", self._host)
+        self._port = kwargs.get("port", self._port)
+        self._database = kwargs.get("database", self._database)
+        self._user = kwargs.get("user", self._user)
+        self._password = kwargs.get("password", self._password)
 
         return kwargs
 
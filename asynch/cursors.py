@@ -183,6 +183,7 @@ class Cursor:
         self._query_id = ""
         self._external_tables = {}
         self._types_check = False
+        self._columnar = False
 
     def _make_external_tables(self):
         tables = []
@@ -240,6 +241,7 @@ class Cursor:
             "settings": settings,
             "external_tables": external_tables,
             "types_check": execution_options.get("types_check", self._types_check),
+            "columnar": execution_options.get("columnar", self._columnar),
             "query_id": self._query_id,
         }
 
@@ -327,6 +329,19 @@ class Cursor:
         """
         self._types_check = types_check
 
+    def set_columnar(self, columnar):
+        """
+        Toggles columnar form of INSERT parameters: a sequence of columns
+        instead of a sequence of rows. Saves transposing rows into
+        columns on the client side. Disabled by default.
+        Numeric columns may be passed as ``array.array`` of the same kind
+        and size, those are written without packing items one by one.
+
+        :param columnar: new columnar value.
+        :return: None
+        """
+        self._columnar = columnar
+
     def set_external_table(self, name, structure, data):
         """
         Adds external table to cursor context.
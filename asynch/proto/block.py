@@ -1,3 +1,5 @@
+import struct
+
 from asynch.proto.columns import nestedcolumn
 from asynch.proto.streams.buffered import BufferedReader, BufferedWriter
 
@@ -6,13 +8,13 @@ class BlockInfo:
     is_overflows = False
     bucket_num = -1
 
+    # Field numbers and terminating 0 are single-byte varints.
+    _struct = struct.Struct("<BBBiB")
+
     async def write(self, writer: BufferedWriter):
         # Set of pairs (`FIELD_NUM`, value) in binary form. Then 0.
-        await writer.write_varint(1)
-        await writer.write_uint8(self.is_overflows)
-        await writer.write_varint(2)
-        await writer.write_int32(self.bucket_num)
-        await writer.write_varint(0)
+        packet = self._struct.pack(1, self.is_overflows, 2, self.bucket_num, 0)
+        await writer.write_bytes(packet)
 
     async def read(self, reader: BufferedReader):
         while True:
@@ -57,6 +59,9 @@ class BaseBlock:
     def get_rows(self):
         raise NotImplementedError
 
+    def iter_rows(self):
+        return iter(self.get_rows())
+
     def get_column_by_index(self, index):
         raise NotImplementedError
 
@@ -87,6 +92,10 @@ class ColumnOrientedBlock(BaseBlock):
     def get_rows(self):
         return self.transposed()
 
+    def iter_rows(self):
+        # Build rows lazily, without materializing the transposed list.
+        return zip(*self.data)
+
     def get_column_by_index(self, index):
         return self.data[index]
 
@@ -231,9 +240,7 @@ class BlockStreamProfileInfo:
     async def read(
         self,
     ):
-        self.rows = await self.reader.read_varint()
-        self.blocks = await self.reader.read_varint()
-        self.bytes = await self.reader.read_varint()
+        self.rows, self.blocks, self.bytes = await self.reader.read_varints(3)
         self.applied_limit = bool(await self.reader.read_uint8())
         self.rows_before_limit = await self.reader.read_varint()
         self.calculated_rows_before_limit = bool(await self.reader.read_uint8())
@@ -43,7 +43,7 @@ class ArrayColumn(Column):
     async def size_unpack(
         self,
     ):
-        return self.size_struct.unpack(await self.reader.read_bytes(self.size_struct.size))[0]
+        return (await self.reader.read_struct(self.size_struct))[0]
 
     async def write_items(
         self,
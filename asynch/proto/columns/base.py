@@ -1,3 +1,6 @@
+import sys
+from array import array
+from functools import lru_cache
 from struct import Struct
 from struct import error as struct_error
 
@@ -5,6 +8,23 @@ from ...errors import ColumnTypeMismatchException, StructPackException
 from ..streams.buffered import BufferedReader, BufferedWriter
 
 
+@lru_cache(maxsize=256)
+def get_struct(fmt: str) -> Struct:
+    """
+    Blocks usually have the same number of rows, reuse compiled structs.
+    """
+    return Struct(fmt)
+
+
+# Kinds of array typecodes and struct formats. Arrays of the same kind and
+# item size as the column's format hold exactly the bytes it would pack.
+_format_kinds = {
+    **dict.fromkeys("bhilq", "int"),
+    **dict.fromkeys("BHILQ", "uint"),
+    **dict.fromkeys("fd", "float"),
+}
+
+
 class Column:
     ch_type = None
     py_types = None
@@ -30,11 +50,10 @@ class Column:
         super(Column, self).__init__()
 
     def make_null_struct(self, n_items):
-        return Struct("<{}B".format(n_items))
+        return get_struct("<{}B".format(n_items))
 
     async def _read_nulls_map(self, n_items):
-        s = self.make_null_struct(n_items)
-        return s.unpack(await self.reader.read_bytes(s.size))
+        return await self.reader.read_struct(self.make_null_struct(n_items))
 
     async def _write_nulls_map(self, items):
         s = self.make_null_struct(len(items))
@@ -140,12 +159,27 @@ class FormatColumn(Column):
     format = None
 
     def make_struct(self, n_items):
-        return Struct("<{}{}".format(n_items, self.format))
+        return get_struct("<{}{}".format(n_items, self.format))
+
+    def is_packed(self, items):
+        """
+        :return: whether items is an array laid out as the column's data.
+        """
+        return (
+            isinstance(items, array)
+            and sys.byteorder == "little"
+            and _format_kinds.get(items.typecode) == _format_kinds.get(self.format, False)
+            and items.itemsize == get_struct("<" + self.format).size
+        )
 
     async def write_items(
         self,
         items,
     ):
+        if self.is_packed(items):
+            await self.writer.write_bytes(memoryview(items).cast("B"))
+            return
+
         s = self.make_struct(len(items))
         try:
             await self.writer.write_bytes(s.pack(*items))
@@ -157,9 +191,7 @@ class FormatColumn(Column):
         self,
         n_items,
     ):
-        s = self.make_struct(n_items)
-        unpack_data = s.unpack(await self.reader.read_bytes(s.size))
-        return unpack_data
+        return await self.reader.read_struct(self.make_struct(n_items))
 
 
 # How to write new column?
@@ -13,9 +13,7 @@ class String(Column):
         await self.writer.write_strings(items)
 
     async def read_items(self, n_items):
-        ret = []
-        for _ in range(n_items):
-            ret.append(await self.reader.read_str(as_bytes=self.read_as_bytes))
+        ret = await self.reader.read_strings(n_items, as_bytes=self.read_as_bytes)
         return tuple(ret)
 
 
@@ -37,9 +35,12 @@ class FixedString(String):
         await self.writer.write_fixed_strings(items, self.length)
 
     async def read_items(self, n_items):
-        ret = []
-        for _ in range(n_items):
-            ret.append(await self.reader.read_fixed_str(self.length, as_bytes=self.read_as_bytes))
+        length = self.length
+        # Whole column is read at once, items are sliced out of it.
+        data = await self.reader.read_bytes(length * n_items)
+        ret = [data[i : i + length] for i in range(0, length * n_items, length)]  # noqa: E203
+        if not self.read_as_bytes:
+            ret = [item.decode() for item in ret]
         return tuple(ret)
 
 
@@ -32,8 +32,7 @@ class UUIDColumn(FormatColumn):
         n_items,
     ):
         # TODO: cythonize
-        s = self.make_struct(2 * n_items)
-        items = s.unpack(await self.reader.read_bytes(s.size))
+        items = await self.reader.read_struct(self.make_struct(2 * n_items))
 
         uint_128_items = [None] * n_items
         for i in range(n_items):
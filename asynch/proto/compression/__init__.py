@@ -1,4 +1,5 @@
 import importlib
+import struct
 from typing import TYPE_CHECKING, Type
 
 from asynch.errors import ChecksumDoesntMatchError, UnknownCompressionMethod
@@ -7,6 +8,10 @@ from asynch.proto.protocol import CompressionMethodByte
 if TYPE_CHECKING:
     from asynch.proto.streams.buffered import BufferedReader, BufferedWriter
 
+# Method byte and size with header.
+checksum_header = struct.Struct("<BI")
+uncompressed_size_struct = struct.Struct("<I")
+
 
 def get_compressor_cls(alg) -> Type["BaseCompressor"]:
     try:
@@ -64,7 +69,7 @@ class BaseDecompressor:
     method = None
     method_byte = None
 
-    def __init__(self, reader: "BufferedReader", writer: "BufferedWriter"):
+    def __init__(self, reader: "BufferedReader", writer: "BufferedWriter" = None):
         self.reader = reader
         self.writer = writer
 
@@ -79,15 +84,12 @@ class BaseDecompressor:
 
         compressed = await self.reader.read_bytes(compressed_size)
 
-        await self.writer.write_uint8(method_byte)
-        await self.writer.write_uint32(size_with_header)
-        await self.writer.write_bytes(compressed)
-        if CityHash128(self.writer.buffer) != compressed_hash:
+        # Checksum covers header too, it's hashed along with data at once.
+        packet = bytearray(checksum_header.pack(method_byte, size_with_header))
+        packet += compressed
+        if CityHash128(packet) != compressed_hash:
             raise ChecksumDoesntMatchError()
-        reader = self.reader.__class__(reader=self.reader.reader)
-        reader.buffer = compressed
-        reader.current_buffer_size = len(compressed)
-        uncompressed_size = await reader.read_uint32()
+        uncompressed_size = uncompressed_size_struct.unpack_from(compressed)[0]
         compressed = compressed[4:compressed_size]
         return self.decompress_data(compressed, uncompressed_size)
 
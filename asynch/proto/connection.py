@@ -1,7 +1,12 @@
 import asyncio
 import logging
+import os
+import socket
 import ssl
-from time import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from functools import lru_cache
+from time import monotonic, time
 from types import GeneratorType
 from typing import AsyncGenerator, Optional, Union
 from urllib.parse import urlparse
@@ -31,12 +36,73 @@ from asynch.proto.result import (
 )
 from asynch.proto.settings import write_settings
 from asynch.proto.streams.block import BlockReader, BlockWriter
-from asynch.proto.streams.buffered import BufferedReader, BufferedWriter
-from asynch.proto.utils.escape import escape_params
+from asynch.proto.streams.buffered import (
+    EMPTY_STR,
+    BufferedReader,
+    BufferedWriter,
+    encode_str,
+)
+from asynch.proto.streams.compressed import CompressedBlockReader, CompressedBlockWriter
+from asynch.proto.streams.transport import ClickHouseProtocol
+from asynch.proto.utils.escape import LazyEscapedParams, compile_template, escape_param
 from asynch.proto.utils.helpers import chunks, column_chunks
 
 logger = logging.getLogger(__name__)
 
+# Packet types fit into a single varint byte.
+PING_PACKET = bytes((ClientPacket.PING,))
+CANCEL_PACKET = bytes((ClientPacket.CANCEL,))
+
+
+# Host and port of the connection being opened. Set while the transport is
+# created, wrap_bio() only receives the host name.
+_ssl_session_key: ContextVar = ContextVar("_ssl_session_key", default=None)
+
+
+class _ClientSSLContext(ssl.SSLContext):
+    """
+    Resumes TLS sessions saved by previous connections to the same host and
+    port, so reconnects don't need a full handshake.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.sessions = {}
+
+    def wrap_bio(self, incoming, outgoing, server_side=False, server_hostname=None, session=None):
+        if session is None and not server_side:
+            session = self.sessions.get(_ssl_session_key.get())
+        return super().wrap_bio(incoming, outgoing, server_side, server_hostname, session)
+
+    def save_session(self, key, ssl_object):
+        if ssl_object.session is not None:
+            self.sessions[key] = ssl_object.session
+
+
+@lru_cache(maxsize=32)
+def _build_ssl_context(ssl_version, ca_certs, ciphers, verify, ca_certs_mtime):
+    """
+    Builds client SSL context. Contexts are cached and shared between
+    connections with the same options, loading certificates is expensive.
+    CA file modification time is a part of the key, so rotated certificates
+    are picked up.
+    """
+    ssl_ctx = _ClientSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    if ssl_version:
+        ssl_ctx.options |= ssl_version
+    if ca_certs:
+        ssl_ctx.load_verify_locations(ca_certs)
+    else:
+        ssl_ctx.load_default_certs(ssl.Purpose.SERVER_AUTH)
+    if ciphers:
+        ssl_ctx.set_ciphers(ciphers)
+    if verify:
+        ssl_ctx.verify_mode = ssl.VerifyMode.CERT_REQUIRED
+    else:
+        ssl_ctx.check_hostname = False
+        ssl_ctx.verify_mode = ssl.VerifyMode.CERT_NONE
+    return ssl_ctx
+
 
 class QueryProcessingStage:
     """
@@ -49,6 +115,8 @@ class QueryProcessingStage:
 
 
 class Packet:
+    __slots__ = ("type", "block", "exception", "progress", "profile_info", "multistring_message")
+
     def __init__(self):
         self.type = None
         self.block = None
@@ -70,6 +138,54 @@ class Connection:
         "Debug",
         "Trace",
     )
+    template_cache_size = 128
+
+    __slots__ = (
+        "host",
+        "port",
+        "hosts",
+        "database",
+        "user",
+        "password",
+        "client_name",
+        "connect_timeout",
+        "send_receive_timeout",
+        "sync_request_timeout",
+        "ping_interval",
+        "send_buffer_size",
+        "tcp_nodelay",
+        "secure_socket",
+        "verify",
+        "ssl_options",
+        "compression",
+        "compressor_cls",
+        "compress_block_size",
+        "settings",
+        "settings_is_important",
+        "available_client_settings",
+        "client_settings",
+        "stack_track",
+        "context",
+        "server_info",
+        "client_trace_context",
+        "connected",
+        "is_query_executing",
+        "last_activity",
+        "last_query",
+        "progress",
+        "reader",
+        "writer",
+        "block_reader",
+        "block_reader_raw",
+        "block_reader_cls",
+        "block_writer",
+        "_lock",
+        "_server_str",
+        "_template_cache",
+        "_client_name_bytes",
+        "_user_bytes",
+        "_password_bytes",
+    )
 
     def __init__(  # nosec:B107
         self,
@@ -82,7 +198,10 @@ class Connection:
         connect_timeout: int = constants.DBMS_DEFAULT_CONNECT_TIMEOUT_SEC,
         send_receive_timeout: int = constants.DBMS_DEFAULT_TIMEOUT_SEC,
         sync_request_timeout: int = constants.DBMS_DEFAULT_SYNC_REQUEST_TIMEOUT_SEC,
+        ping_interval: float = constants.DEFAULT_PING_INTERVAL_SEC,
         compress_block_size: int = constants.DEFAULT_COMPRESS_BLOCK_SIZE,
+        send_buffer_size: int = constants.BUFFER_SIZE,
+        tcp_nodelay: bool = True,
         compression: Union[bool, str] = False,
         secure: bool = False,
         # Secure socket parameters.
@@ -108,12 +227,21 @@ class Connection:
         self.database = database
         self.host = None
         self.port = None
+        self._server_str = None
         self.user = user
         self.password = password
         self.client_name = constants.DBMS_NAME + " " + client_name
+        self._client_name_bytes = encode_str(self.client_name)
+        self._user_bytes = encode_str(user)
+        self._password_bytes = encode_str(password)
         self.connect_timeout = connect_timeout
         self.send_receive_timeout = send_receive_timeout
         self.sync_request_timeout = sync_request_timeout
+        self.ping_interval = ping_interval
+        # Outgoing data is flushed to the socket in chunks of this size.
+        self.send_buffer_size = send_buffer_size
+        self.tcp_nodelay = tcp_nodelay
+        self.last_activity = 0.0
         self.settings_is_important = settings_is_important
         self._lock = asyncio.Lock()
         self.secure_socket = secure
@@ -135,10 +263,12 @@ class Connection:
             self.compression = Compression.DISABLED
             self.compressor_cls = None
             self.compress_block_size = None
+            self.block_reader_cls = BlockReader
         else:
             self.compression = Compression.ENABLED
             self.compressor_cls = get_compressor_cls(compression)
             self.compress_block_size = compress_block_size
+            self.block_reader_cls = CompressedBlockReader
         self.connected = False
         self.reader: Optional[BufferedReader] = None
         self.writer: Optional[BufferedWriter] = None
@@ -148,8 +278,11 @@ class Connection:
         self.block_reader: Optional[BlockReader] = None
         self.block_writer: Optional[BlockWriter] = None
         self.block_reader_raw: Optional[BlockReader] = None
+        # Refilled in place by every PROGRESS packet.
+        self.progress: Optional[Progress] = None
         self.is_query_executing = False
         self.client_trace_context = None
+        self._template_cache = OrderedDict()
 
         self.settings = kwargs.pop("settings", {}).copy()
         self.client_settings = {
@@ -159,6 +292,12 @@ class Connection:
                     constants.DEFAULT_INSERT_BLOCK_SIZE,
                 )
             ),
+            "insert_block_max_bytes": int(
+                self.settings.pop(
+                    "insert_block_max_bytes",
+                    constants.DEFAULT_INSERT_BLOCK_MAX_BYTES,
+                )
+            ),
             "strings_as_bytes": self.settings.pop("strings_as_bytes", False),
             "strings_encoding": self.settings.pop("strings_encoding", constants.STRINGS_ENCODING),
             "use_numpy": self.settings.pop("use_numpy", False),
@@ -172,6 +311,7 @@ class Connection:
         self.last_query: Optional[QueryInfo] = None
         self.available_client_settings = (
             "insert_block_size",  # TODO: rename to max_insert_block_size
+            "insert_block_max_bytes",
             "strings_as_bytes",
             "strings_encoding",
             "use_numpy",
@@ -184,24 +324,11 @@ class Connection:
         self.context.client_settings = self.client_settings
 
     def get_block_reader(self):
-        if self.compression:
-            from asynch.proto.streams.compressed import CompressedBlockReader
-
-            return CompressedBlockReader(
-                self.reader,
-                self.writer,
-                self.context,
-            )
-        else:
-            from asynch.proto.streams.block import BlockReader
-
-            return BlockReader(self.reader, self.writer, self.context)
+        return self.block_reader_cls(self.reader, self.writer, self.context)
 
     def get_block_writer(self):
         if self.compression:
             compressor = self.compressor_cls(BufferedWriter())
-            from .streams.compressed import CompressedBlockWriter
-
             return CompressedBlockWriter(
                 self.reader,
                 self.writer,
@@ -209,30 +336,29 @@ class Connection:
                 compressor,
                 self.compress_block_size,
             )
-        else:
-            from .streams.block import BlockWriter
 
-            return BlockWriter(self.reader, self.writer, self.context)
+        return BlockWriter(self.reader, self.writer, self.context)
 
     async def send_hello(self):
         await self.writer.write_varint(ClientPacket.HELLO)
-        await self.writer.write_str(self.client_name)
+        await self.writer.write_bytes(self._client_name_bytes)
         await self.writer.write_varint(constants.CLIENT_VERSION_MAJOR)
         await self.writer.write_varint(constants.CLIENT_VERSION_MINOR)
         await self.writer.write_varint(constants.CLIENT_REVISION)
+        # Database may be changed by USE query, so it is not cached.
         await self.writer.write_str(self.database)
-        await self.writer.write_str(self.user)
-        await self.writer.write_str(self.password)
+        await self.writer.write_bytes(self._user_bytes)
+        await self.writer.write_bytes(self._password_bytes)
         await self.writer.flush()
 
     def get_server(self):
-        return "{}:{}".format(self.host, self.port)
+        return self._server_str
 
     def unexpected_packet_message(self, expected, packet_type):
         packet_type = ServerPacket.to_str(packet_type)
 
         return "Unexpected packet from server {} (expected {}, got {})".format(
-            self.get_server(), expected, packet_type
+            self._server_str, expected, packet_type
         )
 
     async def receive_hello(self):
@@ -283,28 +409,27 @@ class Connection:
     def _get_ssl_context(self):
         if not self.secure_socket:
             return None
-        ssl_ctx = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
-        ssl_version = self.ssl_options.get("ssl_version")
-        if ssl_version:
-            ssl_ctx.options |= ssl_version
         ca_certs = self.ssl_options.get("ca_certs")
-        if ca_certs:
-            ssl_ctx.load_verify_locations(ca_certs)
-        else:
-            ssl_ctx.load_default_certs(ssl.Purpose.SERVER_AUTH)
-        ciphers = self.ssl_options.get("ciphers")
-        if ciphers:
-            ssl_ctx.set_ciphers(ciphers)
-        if self.verify:
-            ssl_ctx.verify_mode = ssl.VerifyMode.CERT_REQUIRED
-        else:
-            ssl_ctx.check_hostname = False
-            ssl_ctx.verify_mode = ssl.VerifyMode.CERT_NONE
-        return ssl_ctx
+        try:
+            ca_certs_mtime = os.stat(ca_certs).st_mtime_ns if ca_certs else None
+        except OSError:
+            # Missing file is reported by load_verify_locations.
+            ca_certs_mtime = None
+        return _build_ssl_context(
+            self.ssl_options.get("ssl_version"),
+            ca_certs,
+            self.ssl_options.get("ciphers"),
+            self.verify,
+            ca_certs_mtime,
+        )
 
     async def ping(self):
+        if not self.connected:
+            # Nothing to ping, don't go through the failing write.
+            return False
+
         try:
-            await self.writer.write_varint(ClientPacket.PING)
+            await self.writer.write_bytes(PING_PACKET)
             await self.writer.flush()
             packet_type = await self.reader.read_varint()
             while packet_type == ServerPacket.PROGRESS:
@@ -313,6 +438,7 @@ class Connection:
             if packet_type != ServerPacket.PONG:
                 msg = self.unexpected_packet_message("Pong", packet_type)
                 raise UnexpectedPacketFromServerError(msg)
+            self.last_activity = monotonic()
         except IndexError as e:
             logger.debug(
                 "Ping package smaller than expected or empty. "
@@ -335,7 +461,8 @@ class Connection:
         revision = self.server_info.revision
 
         if revision >= constants.DBMS_MIN_REVISION_WITH_TEMPORARY_TABLES:
-            await self.reader.read_str()
+            # Temporary table name is not used.
+            await self.reader.skip_str()
 
         return await (self.block_reader_raw if raw else self.block_reader).read()
 
@@ -346,7 +473,10 @@ class Connection:
         code = await self.reader.read_int32()
         name = await self.reader.read_str()
         message = await self.reader.read_str()
-        stack_trace = await self.reader.read_str()
+        if self.stack_track:
+            stack_trace = await self.reader.read_str()
+        else:
+            await self.reader.skip_str()
         has_nested = bool(await self.reader.read_uint8())
 
         new_message = ""
@@ -373,9 +503,12 @@ class Connection:
 
     async def receive_multistring_message(self, packet_type: int):
         num = ServerPacket.strings_in_message(packet_type)
-        return [await self.reader.read_str() for _i in range(num)]
+        return await self.reader.read_strings(num)
 
     def log_block(self, block):
+        if not logger.isEnabledFor(logging.INFO):
+            return
+
         column_names = [x[0] for x in block.columns_with_types]
 
         for row in block.get_rows():
@@ -432,6 +565,7 @@ class Connection:
         packet = Packet()
 
         packet.type = packet_type = await self.reader.read_varint()
+        self.last_activity = monotonic()
 
         if packet_type == ServerPacket.DATA:
             packet.block = await self.receive_data()
@@ -498,19 +632,22 @@ class Connection:
             return await result.get_result()
 
     async def receive_progress(self):
-        progress = Progress(self.reader)
+        progress = self.progress
         await progress.read(
             self.server_info.revision,
         )
         return progress
 
     async def send_cancel(self):
-        await self.writer.write_varint(ClientPacket.CANCEL)
+        await self.writer.write_bytes(CANCEL_PACKET)
         await self.writer.flush()
 
     async def send_query(self, query: str, query_id: str = ""):
         await self.writer.write_varint(ClientPacket.QUERY)
-        await self.writer.write_str(query_id)
+        if query_id:
+            await self.writer.write_str(query_id)
+        else:
+            await self.writer.write_bytes(EMPTY_STR)
         revision = self.server_info.revision
         if revision >= constants.DBMS_MIN_REVISION_WITH_CLIENT_INFO:
             client_info = ClientInfo(self.client_name, self.writer, self.context)
@@ -524,7 +661,7 @@ class Connection:
             self.writer, self.context.settings, settings_as_strings, self.settings_is_important
         )
         if revision >= constants.DBMS_MIN_REVISION_WITH_INTERSERVER_SECRET:
-            await self.writer.write_str("")
+            await self.writer.write_bytes(EMPTY_STR)
         await self.writer.write_varint(QueryProcessingStage.COMPLETE)
         await self.writer.write_varint(self.compression)
 
@@ -532,22 +669,105 @@ class Connection:
             query,
         )
 
-        logger.debug("Query: %s", query)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Query: %s", query)
 
         await self.writer.flush()
 
-    async def _init_connection(self, host: str, port: int):
+    async def _open_connection(self, host: str, port: int) -> ClickHouseProtocol:
+        loop = asyncio.get_running_loop()
+        token = _ssl_session_key.set((host, port))
+        try:
+            _, protocol = await loop.create_connection(
+                lambda: ClickHouseProtocol(constants.BUFFER_SIZE),
+                host,
+                port,
+                ssl=self._get_ssl_context(),
+            )
+        finally:
+            _ssl_session_key.reset(token)
+        return protocol
+
+    async def _open_first_connection(self):
+        """
+        Connects to all hosts at once and picks the first one that answers,
+        the rest of attempts are cancelled or closed.
+
+        :return: tuple of host, port and protocol of the established connection.
+        """
+        if len(self.hosts) == 1:
+            host, port = self.hosts[0]
+            return host, port, await self._open_connection(host, port)
+
+        loop = asyncio.get_running_loop()
+        tasks = {
+            loop.create_task(self._open_connection(host, port)): (host, port)
+            for host, port in self.hosts
+        }
+        deadline = loop.time() + self.connect_timeout
+        pending = set(tasks)
+        winner = None
+        error = None
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=deadline - loop.time(),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    break
+
+                for task in done:
+                    if task.exception() is None:
+                        winner = winner or task
+                    else:
+                        error = task.exception()
+                        logger.warning("Failed to connect to %s:%s: %s", *tasks[task], error)
+        finally:
+            losers = [task for task in tasks if task is not winner]
+            for task in losers:
+                task.cancel()
+            # Attempts may still connect before they see the cancellation.
+            for result in await asyncio.gather(*losers, return_exceptions=True):
+                if isinstance(result, ClickHouseProtocol):
+                    result.close()
+
+        if winner is not None:
+            return (*tasks[winner], winner.result())
+        if pending or error is None:
+            raise asyncio.TimeoutError()
+        raise error
+
+    async def _init_connection(self, host: str, port: int, protocol: ClickHouseProtocol):
         self.host, self.port = host, port
-        reader, writer = await asyncio.open_connection(host, port, ssl=self._get_ssl_context())
-        self.writer = BufferedWriter(writer)
-        self.reader = BufferedReader(reader)
+        self._server_str = "{}:{}".format(host, port)
+        self._configure_transport(protocol)
+        self.writer = BufferedWriter(protocol, self.send_buffer_size)
+        self.reader = BufferedReader(protocol)
         self.block_reader = self.get_block_reader()
         self.block_reader_raw = BlockReader(self.reader, self.writer, self.context)
         self.block_writer = self.get_block_writer()
+        self.progress = Progress(self.reader)
 
         self.connected = True
         await self.send_hello()
         await self.receive_hello()
+        self.last_activity = monotonic()
+
+        ssl_object = protocol.get_extra_info("ssl_object")
+        if ssl_object is not None:
+            # Session tickets have arrived along with the server hello.
+            ssl_object.context.save_session((host, port), ssl_object)
+
+    def _configure_transport(self, protocol: ClickHouseProtocol):
+        sock = protocol.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            # Don't let Nagle's algorithm hold back small control packets.
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, int(self.tcp_nodelay))
+
+        # Let drain() return immediately until a whole buffer is pending.
+        protocol.transport.set_write_buffer_limits(high=self.send_buffer_size)
 
     def reset_state(self):
         self.writer = None
@@ -555,10 +775,12 @@ class Connection:
         self.block_reader = None
         self.block_reader_raw = None
         self.block_writer = None
+        self.progress = None
         self.connected = False
 
         self.client_trace_context = None
         self.server_info = None
+        self.last_activity = 0.0
 
         self.is_query_executing = False
 
@@ -573,9 +795,9 @@ class Connection:
         if self.connected:
             await self.disconnect()
         logger.debug("Connecting. Database: %s. User: %s", self.database, self.user)
-        for host, port in self.hosts:
-            logger.debug("Connecting to %s:%s", host, port)
-            return await self._init_connection(host, port)
+        host, port, protocol = await self._open_first_connection()
+        logger.debug("Connected to %s:%s", host, port)
+        await self._init_connection(host, port, protocol)
 
     async def execute(
         self,
@@ -753,6 +975,10 @@ class Connection:
         if not self.connected:
             await self.connect()
 
+        elif monotonic() - self.last_activity < self.ping_interval:
+            # Connection was used recently, skip round-trip to the server.
+            return
+
         elif not await self.ping():
             logger.warning("Connection was closed, reconnecting.")
             await self.connect()
@@ -786,22 +1012,54 @@ class Connection:
         await self.send_block(RowOrientedBlock())
 
     async def send_block(self, block, table_name=""):
+        await self._write_data_header(table_name)
+        await self.block_writer.write(block)
+
+    async def send_serialized_block(self, data, table_name=""):
+        await self._write_data_header(table_name)
+        await self.block_writer.write_serialized(data)
+
+    async def _write_data_header(self, table_name):
         await self.writer.write_varint(ClientPacket.DATA)
 
         revision = self.server_info.revision
         if revision >= constants.DBMS_MIN_REVISION_WITH_TEMPORARY_TABLES:
-            await self.writer.write_str(
-                table_name,
-            )
-
-        await self.block_writer.write(block)
+            if table_name:
+                await self.writer.write_str(table_name)
+            else:
+                await self.writer.write_bytes(EMPTY_STR)
 
     def substitute_params(self, query, params):
         if not isinstance(params, dict):
             raise ValueError("Parameters are expected in dict form")
 
-        escaped = escape_params(params)
-        return query % escaped
+        template = self._get_template(query)
+        if template is None:
+            return query % LazyEscapedParams(params)
+
+        literals, keys = template
+        escaped = {}
+        parts = [literals[0]]
+        for key, literal in zip(keys, literals[1:]):
+            if key not in escaped:
+                escaped[key] = str(escape_param(params[key]))
+            parts.append(escaped[key])
+            parts.append(literal)
+
+        return "".join(parts)
+
+    def _get_template(self, query):
+        cache = self._template_cache
+        try:
+            template = cache[query]
+        except KeyError:
+            template = cache[query] = compile_template(query)
+            if len(cache) > self.template_cache_size:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(query)
+
+        return template
 
     async def process_insert_query(
         self,
@@ -852,14 +1110,45 @@ class Connection:
         block_cls = ColumnOrientedBlock if columnar else RowOrientedBlock
         slicer = column_chunks if columnar else chunks
 
+        max_block_bytes = client_settings["insert_block_max_bytes"]
+        # Lowered once a block turns out to be larger than max_block_bytes.
+        rows_per_block = None
+
         for chunk in slicer(data, client_settings["insert_block_size"]):
-            block = block_cls(
-                columns_with_types=sample_block.columns_with_types,
-                data=chunk,
-                types_check=types_check,
-            )
-            await self.send_block(block)
-            inserted_rows += block.num_rows
+            if not max_block_bytes:
+                block = block_cls(
+                    columns_with_types=sample_block.columns_with_types,
+                    data=chunk,
+                    types_check=types_check,
+                )
+                await self.send_block(block)
+                inserted_rows += block.num_rows
+                continue
+
+            # Parts left to send, in reverse order.
+            parts = list(slicer(chunk, rows_per_block)) if rows_per_block else [chunk]
+            parts.reverse()
+            while parts:
+                part = parts.pop()
+                block = block_cls(
+                    columns_with_types=sample_block.columns_with_types,
+                    # Columns are converted in place while serializing, part
+                    # is kept intact in case it has to be split.
+                    data=[column[:] for column in part] if columnar else part,
+                    types_check=types_check,
+                )
+                # Limit applies to uncompressed block data, block is checked
+                # before anything is sent and split if it doesn't fit.
+                serialized = await self.block_writer.serialize(block)
+                block_bytes = len(serialized)
+                if block_bytes > max_block_bytes and block.num_rows > 1:
+                    rows_per_block = max(1, max_block_bytes * block.num_rows // block_bytes)
+                    parts.extend(reversed(list(slicer(part, rows_per_block))))
+                    continue
+
+                # Single row larger than the limit is sent as is.
+                await self.send_serialized_block(serialized)
+                inserted_rows += block.num_rows
 
         # Empty block means end of data.
         await self.send_block(block_cls())
@@ -873,23 +1162,27 @@ class Connection:
         external_tables=None,
         query_id=None,
         types_check=False,
+        columnar=False,
     ):
         if params is not None:
             query = self.substitute_params(query, params)
 
         await self.send_query(query, query_id=query_id)
         await self.send_external_tables(external_tables, types_check=types_check)
-        return self.iter_receive_result(with_column_types=with_column_types)
+        return self.iter_receive_result(with_column_types=with_column_types, columnar=columnar)
 
-    def iter_receive_result(self, with_column_types=False):
+    def iter_receive_result(self, with_column_types=False, columnar=False):
         gen = self.packet_generator()
 
-        return IterQueryResult(gen, with_column_types=with_column_types)
+        return IterQueryResult(gen, with_column_types=with_column_types, columnar=columnar)
 
     def track_current_database(self, query):
-        query = query.strip("; ")
-        if query.lower().startswith("use "):
-            self.database = query[4:].strip()
+        # Only look at the prefix, INSERT queries with inlined data can be large.
+        query = query.lstrip("; ")
+        if query[:4].lower() == "use ":
+            database = query.rstrip("; ")[4:].strip()
+            if database:
+                self.database = database
 
     async def execute_iter(
         self,
@@ -900,6 +1193,7 @@ class Connection:
         query_id="",
         settings=None,
         types_check=False,
+        columnar=False,
     ):
         """
         *New in version 0.0.14.*
@@ -922,6 +1216,11 @@ class Connection:
                          Defaults to ``None`` (no additional settings).
         :param types_check: enables type checking of data for INSERT queries.
                             Causes additional overhead. Defaults to ``False``.
+        :param columnar: if specified the result of the SELECT query will be
+                         streamed by blocks in column-oriented form: every
+                         item is a list of columns of one block.
+                         It also allows to INSERT data in columnar form.
+                         Defaults to ``False`` (row-like form).
         :return: :ref:`iter-query-result` proxy.
         """
 
@@ -935,7 +1234,7 @@ class Connection:
                     external_tables=external_tables,
                     query_id=query_id,
                     types_check=types_check,
-                    columnar=False,
+                    columnar=columnar,
                 )
             else:
                 return await self.iter_process_ordinary_query(
@@ -945,4 +1244,5 @@ class Connection:
                     external_tables=external_tables,
                     query_id=query_id,
                     types_check=types_check,
+                    columnar=columnar,
                 )
@@ -31,8 +31,14 @@ DBMS_DEFAULT_TIMEOUT_SEC = 300
 
 DBMS_DEFAULT_SYNC_REQUEST_TIMEOUT_SEC = 5
 
+# Reused connection is pinged only after being idle for this long.
+DEFAULT_PING_INTERVAL_SEC = 5
+
 DEFAULT_COMPRESS_BLOCK_SIZE = 1048576
 DEFAULT_INSERT_BLOCK_SIZE = 1048576
+# Limit of serialized insert block size in bytes before compression,
+# 0 means no limit.
+DEFAULT_INSERT_BLOCK_MAX_BYTES = 0
 
 DBMS_NAME = "ClickHouse"
 CLIENT_NAME = "asynch"
@@ -1,3 +1,4 @@
+from types import MappingProxyType
 from typing import TYPE_CHECKING, Optional
 
 from asynch.proto.result import QueryInfo
@@ -23,7 +24,8 @@ class Context:
 
     @property
     def settings(self):
-        return self._settings.copy()
+        # Read-only view, settings are read many times per query.
+        return MappingProxyType(self._settings)
 
     @settings.setter
     def settings(self, value):
@@ -31,7 +33,7 @@ class Context:
 
     @property
     def client_settings(self):
-        return self._client_settings.copy()
+        return MappingProxyType(self._client_settings)
 
     @client_settings.setter
     def client_settings(self, value):
@@ -39,6 +41,8 @@ class Context:
 
 
 class ExecuteContext:
+    __slots__ = ("_query", "_settings", "_connection")
+
     def __init__(self, connection: "Connection", query, settings):
         self._query = query
         self._settings = settings
@@ -1,15 +1,32 @@
 import getpass
 import socket
-from time import time
+from time import time_ns
 
 from asynch.errors import LogicalError
 from asynch.proto import constants
 from asynch.proto.context import Context
 from asynch.proto.opentelemetry import OpenTelemetryTraceContext
-from asynch.proto.streams.buffered import BufferedWriter
+from asynch.proto.streams.buffered import (
+    MAX_UINT64,
+    STRUCTS,
+    UINT128,
+    BufferedWriter,
+    encode_str,
+    encode_varint,
+)
 
 
 class ServerInfo:
+    __slots__ = (
+        "name",
+        "version_major",
+        "version_minor",
+        "version_patch",
+        "revision",
+        "timezone",
+        "display_name",
+    )
+
     def __init__(
         self,
         name: str,
@@ -59,16 +76,29 @@ class ClientInfo:
     initial_query_id = ""
     initial_address = "0.0.0.0:0"
 
-    quota_key = ""
+    __slots__ = (
+        "query_kind",
+        "os_user",
+        "client_hostname",
+        "client_name",
+        "writer",
+        "quota_key",
+        "client_trace_context",
+        "distributed_depth",
+        "initial_query_start_time_microseconds",
+    )
+
+    # Looked up once on first use, see refresh_host().
+    _os_user = None
+    _client_hostname = None
 
     def __init__(self, client_name: str, writer: BufferedWriter, context: Context):
         self.query_kind = QueryKind.NO_QUERY
 
-        try:
-            self.os_user = getpass.getuser()
-        except KeyError:
-            self.os_user = ""
-        self.client_hostname = socket.gethostname()
+        if self._client_hostname is None:
+            self.refresh_host()
+        self.os_user = self._os_user
+        self.client_hostname = self._client_hostname
         self.client_name = client_name
         self.writer = writer
         self.quota_key = context.client_settings["quota_key"]
@@ -77,96 +107,77 @@ class ClientInfo:
             context.client_settings["opentelemetry_tracestate"],
         )
         self.distributed_depth = 0
-        self.initial_query_start_time_microseconds = int(time() * 1000000)
+        self.initial_query_start_time_microseconds = time_ns() // 1000
+
+    @classmethod
+    def refresh_host(cls):
+        """
+        Looks up OS user and host name sent to the server.
+        """
+        try:
+            cls._os_user = getpass.getuser()
+        except KeyError:
+            cls._os_user = ""
+        cls._client_hostname = socket.gethostname()
 
     @property
     def empty(self):
         return self.query_kind == QueryKind.NO_QUERY
 
     async def write(self, server_revision: int):
-        revision = server_revision
         if server_revision < constants.DBMS_MIN_REVISION_WITH_CLIENT_INFO:
             raise LogicalError(
                 "Method ClientInfo.write is called " "for unsupported server revision"
             )
-        writer = self.writer
-        await writer.write_int8(
-            self.query_kind,
-        )
+        await self.writer.write_bytes(self.encode(server_revision))
+
+    def encode(self, revision: int) -> bytearray:
+        """
+        Serializes client info for the given server revision, so it can be
+        handed to the writer at once.
+        """
+        packet = bytearray(STRUCTS["b"].pack(self.query_kind))
         if self.empty:
-            return
+            return packet
 
-        await writer.write_str(
-            self.initial_user,
-        )
-        await writer.write_str(
-            self.initial_query_id,
-        )
-        await writer.write_str(
-            self.initial_address,
-        )
+        packet += encode_str(self.initial_user)
+        packet += encode_str(self.initial_query_id)
+        packet += encode_str(self.initial_address)
         if revision >= constants.DBMS_MIN_PROTOCOL_VERSION_WITH_INITIAL_QUERY_START_TIME:
-            await self.writer.write_uint64(self.initial_query_start_time_microseconds)
-        await writer.write_uint8(
-            self.interface,
-        )
+            packet += STRUCTS["Q"].pack(self.initial_query_start_time_microseconds)
+        packet += STRUCTS["B"].pack(self.interface)
 
-        await writer.write_str(
-            self.os_user,
-        )
-        await writer.write_str(
-            self.client_hostname,
-        )
-        await writer.write_str(
-            self.client_name,
-        )
-        await writer.write_varint(
-            self.client_version_major,
-        )
-        await writer.write_varint(
-            self.client_version_minor,
-        )
-        await writer.write_varint(
-            self.client_revision,
-        )
+        packet += encode_str(self.os_user)
+        packet += encode_str(self.client_hostname)
+        packet += encode_str(self.client_name)
+        packet += encode_varint(self.client_version_major)
+        packet += encode_varint(self.client_version_minor)
+        packet += encode_varint(self.client_revision)
 
         if revision >= constants.DBMS_MIN_REVISION_WITH_QUOTA_KEY_IN_CLIENT_INFO:
-            await writer.write_str(
-                self.quota_key,
-            )
+            packet += encode_str(self.quota_key)
         if revision >= constants.DBMS_MIN_PROTOCOL_VERSION_WITH_DISTRIBUTED_DEPTH:
-            await self.writer.write_varint(self.distributed_depth)
+            packet += encode_varint(self.distributed_depth)
         if revision >= constants.DBMS_MIN_REVISION_WITH_VERSION_PATCH:
-            await writer.write_varint(
-                self.client_version_patch,
-            )
+            packet += encode_varint(self.client_version_patch)
         if revision >= constants.DBMS_MIN_REVISION_WITH_OPENTELEMETRY:
-            if self.client_trace_context.trace_id is not None:
+            trace_context = self.client_trace_context
+            if trace_context.trace_id is not None:
                 # Have OpenTelemetry header.
-                await self.writer.write_uint8(1)
-                await self.writer.write_uint128(
-                    self.client_trace_context.trace_id,
-                )
-                await self.writer.write_uint64(
-                    self.client_trace_context.span_id,
-                )
-                await self.writer.write_str(
-                    self.client_trace_context.tracestate,
-                )
-                await self.writer.write_uint8(
-                    self.client_trace_context.trace_flags,
-                )
+                packet += STRUCTS["B"].pack(1)
+                trace_id = trace_context.trace_id
+                packet += UINT128.pack((trace_id >> 64) & MAX_UINT64, trace_id & MAX_UINT64)
+                packet += STRUCTS["Q"].pack(trace_context.span_id)
+                packet += encode_str(trace_context.tracestate)
+                packet += STRUCTS["B"].pack(trace_context.trace_flags)
             else:
                 # Don't have OpenTelemetry header.
-                await self.writer.write_uint8(0)
+                packet += STRUCTS["B"].pack(0)
 
         if revision >= constants.DBMS_MIN_REVISION_WITH_PARALLEL_REPLICAS:
-            await self.writer.write_varint(
-                0,
-            )  # collaborate_with_initiator
-            await self.writer.write_varint(
-                0,
-            )  # count_participating_replicas
-            await self.writer.write_varint(
-                0,
-            )  # number_of_current_replica
+            # collaborate_with_initiator, count_participating_replicas,
+            # number_of_current_replica
+            packet += b"\x00\x00\x00"
+
+        return packet
+
@@ -3,6 +3,8 @@ from asynch.proto.streams.buffered import BufferedReader
 
 
 class Progress:
+    __slots__ = ("rows", "bytes", "total_rows", "written_rows", "written_bytes", "reader")
+
     def __init__(self, reader: BufferedReader):
         self.rows = 0
         self.bytes = 0
@@ -15,16 +17,21 @@ class Progress:
         self,
         server_revision,
     ):
-        self.rows = await self.reader.read_varint()
-        self.bytes = await self.reader.read_varint()
-
         revision = server_revision
-        if revision >= constants.DBMS_MIN_REVISION_WITH_TOTAL_ROWS_IN_PROGRESS:
-            self.total_rows = await self.reader.read_varint()
+        with_total_rows = revision >= constants.DBMS_MIN_REVISION_WITH_TOTAL_ROWS_IN_PROGRESS
+        with_write_info = revision >= constants.DBMS_MIN_REVISION_WITH_CLIENT_WRITE_INFO
+
+        # Progress packet is tiny and usually buffered as a whole.
+        values = iter(await self.reader.read_varints(2 + with_total_rows + 2 * with_write_info))
+        self.rows = next(values)
+        self.bytes = next(values)
+
+        if with_total_rows:
+            self.total_rows = next(values)
 
-        if revision >= constants.DBMS_MIN_REVISION_WITH_CLIENT_WRITE_INFO:
-            self.written_rows = await self.reader.read_varint()
-            self.written_bytes = await self.reader.read_varint()
+        if with_write_info:
+            self.written_rows = next(values)
+            self.written_bytes = next(values)
 
     def increment(self, another_progress):
         self.rows += another_progress.rows
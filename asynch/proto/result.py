@@ -104,12 +104,14 @@ class IterQueryResult:
     Provides iteration over returned data by chunks (streaming by chunks).
     """
 
-    def __init__(self, packet_generator, with_column_types=False):
+    def __init__(self, packet_generator, with_column_types=False, columnar=False):
         self.packet_generator = packet_generator
         self.with_column_types = with_column_types
+        self.columnar = columnar
         self._columns_with_types = []
 
-        self.data = []
+        # Rows of the current block, consumed lazily.
+        self._rows = iter(())
         self.first_block = True
         self.EOF = False
 
@@ -128,35 +130,35 @@ class IterQueryResult:
         if self.first_block and self.with_column_types:
             self.first_block = False
             self._columns_with_types = block.columns_with_types
-            rv = []
-            rv.extend(block.get_rows())
-            return rv
-        else:
-            return block.get_rows()
+
+        if self.columnar:
+            # Whole block is one item, header block contains no rows.
+            return iter((block.get_columns(),) if block.num_rows else ())
+        return block.iter_rows()
 
     async def next(self, default=[]):
-        if self.EOF:
-            raise StopAsyncIteration
+        while not self.EOF:
+            row = next(self._rows, None)
+            if row is not None:
+                return row
 
-        if not self.data:
             rows = await self._get_next_()
             if rows is None:
                 # The end of stream
                 self.EOF = True
-            elif rows:
-                self.data += rows
-
-            return await self.next()
+            else:
+                self._rows = rows
 
-        else:
-            return self.data.pop(0)
+        raise StopAsyncIteration
 
     async def get_columns_with_types(self):
         if self._columns_with_types:
             return self._columns_with_types
 
         if self.first_block and self.with_column_types:
-            self.data += await self._get_next_()
+            rows = await self._get_next_()
+            if rows is not None:
+                self._rows = rows
             return self._columns_with_types
         else:
             return []
@@ -167,6 +169,8 @@ class IterQueryResult:
 
 
 class QueryInfo:
+    __slots__ = ("profile_info", "progress", "elapsed")
+
     def __init__(self, reader: BufferedReader):
         self.profile_info = BlockStreamProfileInfo(reader)
         self.progress = Progress(reader)
@@ -1,4 +1,5 @@
 import logging
+from collections import OrderedDict
 from typing import Dict
 
 from asynch.proto.settings.available import settings as available_settings
@@ -6,9 +7,42 @@ from asynch.proto.streams.buffered import BufferedWriter
 
 logger = logging.getLogger(__name__)
 
+# Settings usually stay the same from query to query, keep their encoded form.
+ENCODED_SETTINGS_CACHE_SIZE = 128
+_encoded_settings = OrderedDict()
+
 
 async def write_settings(
     writer: BufferedWriter, settings: Dict, settings_as_strings, settings_is_important: bool
+):
+    try:
+        # Value type is a part of the key: True and 1 are equal but encoded differently.
+        key = (
+            tuple((name, type(value), value) for name, value in (settings or {}).items()),
+            settings_as_strings,
+            settings_is_important,
+        )
+        packet = _encoded_settings.get(key)
+    except TypeError:
+        # Unhashable setting value.
+        key = packet = None
+
+    if packet is None:
+        buffer = BufferedWriter()
+        await _write_settings(buffer, settings, settings_as_strings, settings_is_important)
+        packet = bytes(buffer.buffer)
+        if key is not None:
+            _encoded_settings[key] = packet
+            if len(_encoded_settings) > ENCODED_SETTINGS_CACHE_SIZE:
+                _encoded_settings.popitem(last=False)
+    else:
+        _encoded_settings.move_to_end(key)
+
+    await writer.write_bytes(packet)
+
+
+async def _write_settings(
+    writer: BufferedWriter, settings: Dict, settings_as_strings, settings_is_important: bool
 ):
     for setting, value in (settings or {}).items():
         # If the server support settings as string we do not need to know
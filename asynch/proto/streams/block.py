@@ -1,8 +1,10 @@
+import sys
+
 from asynch.proto import constants
 from asynch.proto.block import BaseBlock, BlockInfo, ColumnOrientedBlock
 from asynch.proto.columns import read_column, write_column
 from asynch.proto.context import Context
-from asynch.proto.streams.buffered import BufferedReader, BufferedWriter
+from asynch.proto.streams.buffered import BufferedReader, BufferedWriter, encode_varint
 
 
 class BlockWriter:
@@ -20,16 +22,11 @@ class BlockWriter:
         n_columns = block.num_columns
         n_rows = block.num_rows
 
-        await self.writer.write_varint(n_columns)
-        await self.writer.write_varint(n_rows)
+        await self.writer.write_bytes(encode_varint(n_columns) + encode_varint(n_rows))
 
         for i, (col_name, col_type) in enumerate(block.columns_with_types):
-            await self.writer.write_str(
-                col_name,
-            )
-            await self.writer.write_str(
-                col_type,
-            )
+            # Column header precedes column data, both strings go at once.
+            await self.writer.write_strings((col_name, col_type))
 
             if n_columns:
                 try:
@@ -49,6 +46,21 @@ class BlockWriter:
 
         await self.finalize()
 
+    async def serialize(self, block: BaseBlock) -> bytearray:
+        """
+        Serializes block without sending it, see write_serialized().
+
+        :return: uncompressed block data.
+        """
+        # Writer without transport never flushes, everything stays in its buffer.
+        scratch = BlockWriter(self.reader, BufferedWriter(max_buffer_size=sys.maxsize), self.context)
+        await scratch.write(block)
+        return scratch.writer.buffer
+
+    async def write_serialized(self, data: bytearray):
+        await self.writer.write_bytes(data)
+        await self.finalize()
+
     async def finalize(self):
         await self.writer.flush()
 
@@ -66,14 +78,12 @@ class BlockReader:
         if revision >= constants.DBMS_MIN_REVISION_WITH_BLOCK_INFO:
             await info.read(self.reader)
 
-        n_columns = await self.reader.read_varint()
-        n_rows = await self.reader.read_varint()
+        n_columns, n_rows = await self.reader.read_varints(2)
 
         data, names, types = [], [], []
 
         for i in range(n_columns):
-            column_name = await self.reader.read_str()
-            column_type = await self.reader.read_str()
+            column_name, column_type = await self.reader.read_strings(2)
 
             names.append(column_name)
             types.append(column_type)
@@ -1,61 +1,186 @@
 import struct
 from asyncio import StreamReader, StreamWriter
 
-import leb128
-
+from asynch.errors import TooLargeStringSize
 from asynch.proto import constants
 from asynch.proto.compression import BaseCompressor, get_decompressor_cls
 
 MAX_UINT64 = (1 << 64) - 1
 MAX_INT64 = (1 << 63) - 1
 
+# Empty string is just its zero length.
+EMPTY_STR = b"\x00"
+
+# Precompiled little-endian structs for fixed-size integers.
+STRUCTS = {fmt: struct.Struct("<" + fmt) for fmt in "bhiqBHIQ"}
+UINT128 = struct.Struct("<QQ")
+
+# Immutable payloads of at least this size are handed to the transport as
+# is instead of being copied into the write buffer.
+WRITE_THROUGH_SIZE = 1 << 16
+
+
+def encode_varint(number: int) -> bytes:
+    """
+    Encodes unsigned integer as LEB128.
+    """
+    if number < 0x80:
+        return bytes((number,))
+
+    packet = bytearray()
+    while number >= 0x80:
+        packet.append((number & 0x7F) | 0x80)
+        number >>= 7
+    packet.append(number)
+    return bytes(packet)
+
+
+def encode_signed_varint(number: int) -> bytes:
+    """
+    Encodes signed integer as LEB128.
+    """
+    packet = bytearray()
+    while True:
+        byte = number & 0x7F
+        number >>= 7
+        if (number == 0 and not byte & 0x40) or (number == -1 and byte & 0x40):
+            packet.append(byte)
+            return bytes(packet)
+        packet.append(byte | 0x80)
+
+
+def encode_str(data: str) -> bytes:
+    """
+    Encodes string the same way as BufferedWriter.write_str does.
+    """
+    packet = data.encode()
+    return encode_varint(len(packet)) + packet
+
 
 class BufferedWriter:
+    # Large payloads may bypass the buffer, see write_bytes().
+    write_through = True
+
     def __init__(self, writer: StreamWriter = None, max_buffer_size: int = constants.BUFFER_SIZE):
         self.max_buffer_size = max_buffer_size
         self.writer = writer
         self.buffer = bytearray()
         self.position = 0
+        self.bytes_flushed = 0
+        # Buffered data and large payloads waiting for the next flush.
+        self.segments = []
 
     async def flush(self):
         if not self.writer:
             return
-        self.writer.write(self.buffer)
-        self.buffer = bytearray()
-        self.position = 0
+        if self.segments:
+            if self.buffer:
+                self.segments.append(self.buffer)
+                self.buffer = bytearray()
+            # Sent with one vectored write, segments are not joined here.
+            self.writer.writelines(self.segments)
+            self.segments = []
+            self.bytes_flushed += self.position
+            self.position = 0
+        elif self.buffer:
+            self.writer.write(self.buffer)
+            self.bytes_flushed += len(self.buffer)
+            if self._write_buffer_empty():
+                # Transport has sent everything and keeps no reference.
+                self.buffer.clear()
+            else:
+                # Transport may keep a reference to the written buffer until
+                # it's sent, so it can't be cleared in place.
+                self.buffer = bytearray()
+            self.position = 0
+        # Suspends only while the transport is above its high-water mark.
         await self.writer.drain()
 
+    def _write_buffer_empty(self) -> bool:
+        get_write_buffer_size = getattr(self.writer, "get_write_buffer_size", None)
+        if get_write_buffer_size is None:
+            return False
+        return get_write_buffer_size() == 0
+
+    def tell(self) -> int:
+        """
+        :return: number of bytes written so far, flushed or not.
+        """
+        return self.bytes_flushed + self.position
+
     async def write_bytes(self, data: bytes):
-        self.buffer.extend(data)
+        if (
+            len(data) >= WRITE_THROUGH_SIZE
+            and isinstance(data, bytes)
+            and self.write_through
+            and self.writer
+        ):
+            # Keep the payload as a separate segment to avoid copying it.
+            # Transport may hold it after flush, so mutable buffers such as
+            # caller's arrays or views of them are always copied.
+            if self.buffer:
+                self.segments.append(self.buffer)
+                self.buffer = bytearray()
+            self.segments.append(data)
+        else:
+            self.buffer.extend(data)
         self.position += len(data)
         if self.position >= self.max_buffer_size:
             await self.flush()
 
     async def write_varint(self, data: int):
-        packet = leb128.i.encode(data)
+        if 0 <= data < 0x80:
+            # Most varints are small tags and lengths that fit in one byte.
+            self.buffer.append(data)
+            self.position += 1
+            if self.position >= self.max_buffer_size:
+                await self.flush()
+            return
+
+        packet = encode_varint(data) if data > 0 else encode_signed_varint(data)
         await self.write_bytes(packet)
 
+    def _append_str(self, packet: bytes):
+        """
+        Appends length-prefixed string to the buffer without flushing.
+        """
+        length = len(packet)
+        if length < 0x80:
+            self.buffer.append(length)
+            self.position += 1
+        else:
+            prefix = encode_varint(length)
+            self.buffer += prefix
+            self.position += len(prefix)
+        self.buffer += packet
+        self.position += length
+
     async def write_str(self, data: str):
-        packet = data.encode()
-        await self.write_varint(len(packet))
-        await self.write_bytes(packet)
+        self._append_str(data.encode())
+        if self.position >= self.max_buffer_size:
+            await self.flush()
 
     async def write_strings(self, data):
+        max_buffer_size = self.max_buffer_size
         for item in data:
             if isinstance(item, str):
-                packet = item.encode()
-            else:
-                packet = item
-            await self.write_varint(len(packet))
-            await self.write_bytes(packet)
+                item = item.encode()
+            self._append_str(item)
+            if self.position >= max_buffer_size:
+                await self.flush()
 
     async def write_fixed_strings(self, data, length):
+        # Zero-filled chunk for all items, values are copied over it.
+        packet = bytearray(length * len(data))
+        position = 0
         for item in data:
             if isinstance(item, str):
-                packet = item.encode()
-            else:
-                packet = item
-            await self.write_bytes(packet.ljust(length, b"\x00"))
+                item = item.encode()
+            if len(item) > length:
+                raise TooLargeStringSize()
+            packet[position : position + len(item)] = item  # noqa: E203
+            position += length
+        await self.write_bytes(packet)
 
     async def close(self):
         if not self.writer:
@@ -64,8 +189,11 @@ class BufferedWriter:
         await self.writer.wait_closed()
 
     async def write_int(self, data: int, fmt: str):
-        fmt = "<" + fmt
-        await self.write_bytes(struct.pack(fmt, data))
+        s = STRUCTS[fmt]
+        self.buffer += s.pack(data)
+        self.position += s.size
+        if self.position >= self.max_buffer_size:
+            await self.flush()
 
     async def write_int8(
         self,
@@ -98,12 +226,14 @@ class BufferedWriter:
         await self.write_int(data, "Q")
 
     async def write_uint128(self, data: int):
-        fmt = "<QQ"
-        packet = struct.pack(fmt, (data >> 64) & MAX_UINT64, data & MAX_UINT64)
+        packet = UINT128.pack((data >> 64) & MAX_UINT64, data & MAX_UINT64)
         await self.write_bytes(packet)
 
 
 class BufferedReader:
+    # Large reads may bypass the buffer and go to the stream directly.
+    read_through = True
+
     def __init__(self, reader: StreamReader, buffer_max_size: int = constants.BUFFER_SIZE):
         self.buffer_max_size = buffer_max_size
         self.reader = reader
@@ -111,9 +241,23 @@ class BufferedReader:
         self.current_buffer_size = 0
         self.position = 0
 
+    async def _read_from_stream(self, buffer: bytearray, n: int) -> int:
+        """
+        Appends up to n bytes from the stream to the buffer.
+
+        :return: number of bytes appended, 0 at EOF.
+        """
+        read_into = getattr(self.reader, "read_into", None)
+        if read_into is not None:
+            # Transport copies straight into the buffer, see ClickHouseProtocol.
+            return await read_into(buffer, n)
+
+        packet = await self.reader.read(n)
+        buffer += packet
+        return len(packet)
+
     async def _read_into_buffer(self):
-        packet = await self.reader.read(self.buffer_max_size)
-        self.buffer.extend(packet)
+        await self._read_from_stream(self.buffer, self.buffer_max_size)
         self.current_buffer_size = len(self.buffer)
 
     def _read_one(self):
@@ -122,20 +266,21 @@ class BufferedReader:
         return packet
 
     async def read_varint(self):
-        packets = bytearray()
+        result = shift = 0
         while True:
             if self.position == self.current_buffer_size:
                 self._reset_buffer()
                 await self._read_into_buffer()
             packet = self._read_one()
-            packets.append(packet)
+            result |= (packet & 0x7F) << shift
             if packet < 0x80:
-                break
-        return leb128.u.decode(packets)
+                return result
+            shift += 7
 
     def _reset_buffer(self):
         self.position = 0
-        self.buffer = bytearray()
+        # Nothing outside keeps a reference to the buffer, reuse it.
+        self.buffer.clear()
 
     async def read_str(self, as_bytes: bool = False):
         length = await self.read_varint()
@@ -144,6 +289,82 @@ class BufferedReader:
             return packet
         return packet.decode()
 
+    async def skip_str(self):
+        length = await self.read_varint()
+        await self.skip_bytes(length)
+
+    def _read_buffered_str(self, as_bytes: bool = False):
+        """
+        Reads string from the current buffer without awaiting.
+        Returns None and leaves position intact if string is not
+        fully buffered.
+        """
+        buffer = self.buffer
+        end = self.current_buffer_size
+        position = self.position
+
+        length = shift = 0
+        while True:
+            if position == end:
+                return None
+            byte = buffer[position]
+            position += 1
+            length |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+
+        if position + length > end:
+            return None
+
+        packet = buffer[position : position + length]  # noqa: E203
+        self.position = position + length
+        if as_bytes:
+            return packet
+        return packet.decode()
+
+    def _read_buffered_varints(self, n_items: int):
+        """
+        Reads several varints from the current buffer without awaiting.
+        Returns None and leaves position intact if any of them is not
+        fully buffered.
+        """
+        buffer = self.buffer
+        end = self.current_buffer_size
+        position = self.position
+
+        ret = []
+        for _ in range(n_items):
+            result = shift = 0
+            while True:
+                if position == end:
+                    return None
+                byte = buffer[position]
+                position += 1
+                result |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+            ret.append(result)
+
+        self.position = position
+        return ret
+
+    async def read_varints(self, n_items: int):
+        ret = self._read_buffered_varints(n_items)
+        if ret is None:
+            ret = [await self.read_varint() for _ in range(n_items)]
+        return ret
+
+    async def read_strings(self, n_items: int, as_bytes: bool = False):
+        ret = []
+        for _ in range(n_items):
+            item = self._read_buffered_str(as_bytes)
+            if item is None:
+                item = await self.read_str(as_bytes)
+            ret.append(item)
+        return ret
+
     async def read_fixed_str(self, length: int, as_bytes: bool = False):
         packet = await self.read_bytes(length)
         if as_bytes:
@@ -151,22 +372,68 @@ class BufferedReader:
         return packet.decode()
 
     async def read_bytes(self, length: int):
-        packets = bytearray()
+        end = self.position + length
+        if end <= self.current_buffer_size:
+            # Whole range is already buffered.
+            packet = self.buffer[self.position : end]  # noqa: E203
+            self.position = end
+            return packet
+
+        packets = self.buffer[self.position : self.current_buffer_size]  # noqa: E203
+        length -= len(packets)
+        self.position = self.current_buffer_size
+
         while length > 0:
-            if self.position == self.current_buffer_size:
-                self._reset_buffer()
-                await self._read_into_buffer()
+            if self.read_through and length >= self.buffer_max_size:
+                # Large remainder goes straight to the result instead of
+                # being copied through the buffer.
+                read = await self._read_from_stream(packets, length)
+                if not read:
+                    raise EOFError("Unexpected EOF while reading bytes")
+                length -= read
+                continue
+
+            self._reset_buffer()
+            await self._read_into_buffer()
 
             read_position = self.position + length
             packet = self.buffer[self.position : read_position]  # noqa: E203
             length -= len(packet)
             self.position += len(packet)
-            packets.extend(packet)
+            packets += packet
 
         return packets
 
+    async def skip_bytes(self, length: int):
+        while length > 0:
+            if self.position == self.current_buffer_size:
+                self._reset_buffer()
+                await self._read_into_buffer()
+
+            skipped = min(length, self.current_buffer_size - self.position)
+            length -= skipped
+            self.position += skipped
+
+    async def read_struct(self, s: struct.Struct):
+        """
+        Reads and unpacks values described by precompiled struct.
+        """
+        position = self.position
+        if position + s.size <= self.current_buffer_size:
+            # Decode in place, without copying bytes out of the buffer.
+            self.position = position + s.size
+            return s.unpack_from(self.buffer, position)
+
+        return s.unpack(await self.read_bytes(s.size))
+
     async def read_int(self, fmt: str):
-        s = struct.Struct("<" + fmt)
+        s = STRUCTS[fmt]
+        position = self.position
+        if position + s.size <= self.current_buffer_size:
+            # Decode in place, without copying bytes out of the buffer.
+            self.position = position + s.size
+            return s.unpack_from(self.buffer, position)[0]
+
         packet = await self.read_bytes(s.size)
         return s.unpack(packet)[0]
 
@@ -213,12 +480,14 @@ class BufferedReader:
     async def read_uint128(
         self,
     ):
-        hi = await self.read_int("Q")
-        lo = await self.read_int("Q")
+        hi, lo = await self.read_struct(UINT128)
         return (hi << 64) + lo
 
 
 class CompressedBufferedWriter(BufferedWriter):
+    # Everything goes through the buffer to be compressed.
+    write_through = False
+
     def __init__(
         self,
         compressor: BaseCompressor,
@@ -230,10 +499,15 @@ class CompressedBufferedWriter(BufferedWriter):
 
     async def flush(self):
         await self.compressor.write(self.buffer)
+        self.bytes_flushed += len(self.buffer)
+        self.buffer = bytearray()
         self.position = 0
 
 
 class CompressedBufferedReader(BufferedReader):
+    # Stream carries compressed blocks, everything goes through the buffer.
+    read_through = False
+
     def __init__(
         self,
         raw_reader: BufferedReader,
@@ -248,7 +522,7 @@ class CompressedBufferedReader(BufferedReader):
         method_byte = await self.raw_reader.read_uint8()
 
         decompressor_cls = get_decompressor_cls(method_byte)
-        decompressor = decompressor_cls(self.raw_reader, BufferedWriter())
+        decompressor = decompressor_cls(self.raw_reader)
 
         if decompressor.method_byte is not None:
             extra_header_size = 1  # method
@@ -259,6 +533,10 @@ class CompressedBufferedReader(BufferedReader):
             method_byte, compressed_hash, extra_header_size
         )
 
+    def _reset_buffer(self):
+        # Buffer is replaced with decompressed data on every read.
+        self.position = 0
+
     async def _read_into_buffer(self):
         self.buffer = await self._read_compressed_data()
         self.current_buffer_size = len(self.buffer)
@@ -22,7 +22,7 @@ class CompressedBlockWriter(BlockWriter):
         self.compressor = compressor
         self.compress_block_size = compress_block_size
         self.raw_writer = writer
-        self.writer = CompressedBufferedWriter(compressor, writer.writer, constants.BUFFER_SIZE)
+        self.writer = CompressedBufferedWriter(compressor, writer.writer, writer.max_buffer_size)
         super().__init__(reader, self.writer, context)
 
     async def finalize(self):
@@ -30,35 +30,31 @@ class CompressedBlockWriter(BlockWriter):
         await self.writer.flush()
 
         compressed = await self.get_compressed()
-        compressed_size = len(compressed)
 
         compressed_hash = CityHash128(compressed)
         await self.raw_writer.write_uint128(
             compressed_hash,
         )
 
-        block_size = self.compress_block_size
-
-        i = 0
-        while i < compressed_size:
-            await self.raw_writer.write_bytes(compressed[i : i + block_size])  # noqa: E203
-            i += block_size
+        # Written at once, large blocks are copied to bytes here and then
+        # passed to the transport without going through the buffer.
+        await self.raw_writer.write_bytes(bytes(compressed))
 
         await self.raw_writer.flush()
 
     async def get_compressed(self):
-        writer = BufferedWriter()
+        # Built in a plain bytearray, no scratch writer is needed per block.
+        compressed = bytearray()
 
         if self.compressor.method_byte is not None:
-            await writer.write_uint8(self.compressor.method_byte)
+            compressed.append(self.compressor.method_byte)
             extra_header_size = 1  # method
         else:
             extra_header_size = 0
 
-        data = await self.compressor.get_compressed_data(extra_header_size)
-        await writer.write_bytes(data)
+        compressed += await self.compressor.get_compressed_data(extra_header_size)
 
-        return writer.buffer
+        return compressed
 
 
 class CompressedBlockReader(BlockReader):
@@ -0,0 +1,174 @@
+import asyncio
+from typing import Optional
+
+from asynch.proto import constants
+
+
+class ClickHouseProtocol(asyncio.BufferedProtocol):
+    """
+    Receives data straight into a reusable buffer instead of going through
+    the StreamReader queue. Exposes the subset of StreamReader/StreamWriter
+    interface used by BufferedReader and BufferedWriter.
+    """
+
+    def __init__(self, limit: int = constants.BUFFER_SIZE):
+        self.limit = limit
+        self.transport: Optional[asyncio.Transport] = None
+
+        self._buffer = bytearray(limit)
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+
+        self._eof = False
+        self._exception = None
+        self._reading_paused = False
+        self._writing_paused = False
+        self._waiter: Optional[asyncio.Future] = None
+        self._drain_waiter: Optional[asyncio.Future] = None
+        self._closed = asyncio.get_running_loop().create_future()
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def connection_lost(self, exc):
+        self._eof = True
+        self._exception = exc
+        self._wakeup()
+
+        waiter = self._drain_waiter
+        if waiter is not None and not waiter.done():
+            if exc is None:
+                waiter.set_result(None)
+            else:
+                waiter.set_exception(exc)
+
+        if not self._closed.done():
+            self._closed.set_result(None)
+
+    def get_buffer(self, sizehint):
+        if self._start == self._end:
+            self._start = self._end = 0
+
+        elif self._end == len(self._buffer):
+            size = self._end - self._start
+            if self._start:
+                # Move unread bytes to the beginning of the buffer.
+                data = self._view[self._start : self._end].tobytes()  # noqa: E203
+                self._buffer[:size] = data
+            else:
+                # Buffer is full of unread data. Get a larger one.
+                buffer = bytearray(len(self._buffer) * 2)
+                buffer[:size] = self._view
+                self._buffer = buffer
+                self._view = memoryview(buffer)
+            self._start, self._end = 0, size
+
+        return self._view[self._end :]  # noqa: E203
+
+    def buffer_updated(self, nbytes):
+        self._end += nbytes
+        self._wakeup()
+
+        if self._end - self._start >= self.limit and not self._reading_paused:
+            self._reading_paused = True
+            self.transport.pause_reading()
+
+    def eof_received(self):
+        self._eof = True
+        self._wakeup()
+
+    def pause_writing(self):
+        self._writing_paused = True
+
+    def resume_writing(self):
+        self._writing_paused = False
+
+        waiter = self._drain_waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    def _wakeup(self):
+        waiter = self._waiter
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+    async def _wait_for_data(self) -> bool:
+        """
+        :return: False at EOF, True once there is unread data.
+        """
+        while self._start == self._end:
+            if self._exception is not None:
+                raise self._exception
+            if self._eof:
+                return False
+
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        return True
+
+    def _consume(self, n: int) -> memoryview:
+        end = self._end if n < 0 else min(self._start + n, self._end)
+        view = self._view[self._start : end]  # noqa: E203
+        self._start = end
+
+        if self._reading_paused and self._end - self._start < self.limit:
+            self._reading_paused = False
+            self.transport.resume_reading()
+
+        return view
+
+    async def read(self, n: int = -1) -> bytes:
+        if not await self._wait_for_data():
+            return b""
+
+        with self._consume(n) as view:
+            return bytes(view)
+
+    async def read_into(self, buffer: bytearray, n: int = -1) -> int:
+        """
+        Appends up to n bytes to the buffer, copying them straight from the
+        receive buffer.
+
+        :return: number of bytes appended, 0 at EOF.
+        """
+        if not await self._wait_for_data():
+            return 0
+
+        with self._consume(n) as view:
+            buffer += view
+            return len(view)
+
+    def write(self, data):
+        self.transport.write(data)
+
+    def writelines(self, data):
+        self.transport.writelines(data)
+
+    async def drain(self):
+        if self._exception is not None:
+            raise self._exception
+        if self.transport.is_closing():
+            raise ConnectionResetError("Connection lost")
+
+        if self._writing_paused:
+            self._drain_waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._drain_waiter
+            finally:
+                self._drain_waiter = None
+
+    def get_write_buffer_size(self) -> int:
+        return self.transport.get_write_buffer_size()
+
+    def get_extra_info(self, name, default=None):
+        return self.transport.get_extra_info(name, default)
+
+    def close(self):
+        self.transport.close()
+
+    async def wait_closed(self):
+        await self._closed
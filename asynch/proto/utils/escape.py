@@ -1,3 +1,4 @@
+import re
 from datetime import date, datetime
 from enum import Enum
 from uuid import UUID
@@ -16,6 +17,7 @@ escape_chars_map = {
     "\\": "\\\\",
     "'": "\\'",
 }
+escape_chars_table = str.maketrans(escape_chars_map)
 
 
 def escape_param(item):
@@ -23,19 +25,26 @@ def escape_param(item):
         return "NULL"
 
     elif isinstance(item, datetime):
-        return "'%s'" % item.strftime("%Y-%m-%d %H:%M:%S")
+        return "'%04d-%02d-%02d %02d:%02d:%02d'" % (
+            item.year,
+            item.month,
+            item.day,
+            item.hour,
+            item.minute,
+            item.second,
+        )
 
     elif isinstance(item, date):
-        return "'%s'" % item.strftime("%Y-%m-%d")
+        return "'%04d-%02d-%02d'" % (item.year, item.month, item.day)
 
     elif isinstance(item, string_types):
-        return "'%s'" % "".join(escape_chars_map.get(c, c) for c in item)
+        return "'%s'" % item.translate(escape_chars_table)
 
     elif isinstance(item, list):
-        return "[%s]" % ", ".join(text_type(escape_param(x)) for x in item)
+        return "[%s]" % escape_items(item)
 
     elif isinstance(item, tuple):
-        return "(%s)" % ", ".join(text_type(escape_param(x)) for x in item)
+        return "(%s)" % escape_items(item)
 
     elif isinstance(item, Enum):
         return escape_param(item.value)
@@ -47,10 +56,72 @@ def escape_param(item):
         return item
 
 
+def escape_items(items):
+    item_types = set(map(type, items))
+    if len(item_types) == 1:
+        # Homogeneous arrays of numbers and strings skip per item dispatch.
+        item_type = item_types.pop()
+        if item_type is int or item_type is float:
+            return ", ".join(map(str, items))
+        elif item_type is str:
+            return ", ".join(["'%s'" % x.translate(escape_chars_table) for x in items])
+
+    return ", ".join([text_type(escape_param(x)) for x in items])
+
+
 def escape_params(params):
-    escaped = {}
+    return {key: escape_param(value) for key, value in params.items()}
+
+
+class LazyEscapedParams(dict):
+    """
+    Mapping for ``query % params`` that escapes only the parameters
+    the query refers to, on first access.
+    """
+
+    def __init__(self, params):
+        super().__init__()
+        self.params = params
+
+    def __missing__(self, key):
+        value = self[key] = escape_param(self.params[key])
+        return value
+
+
+template_re = re.compile(r"%\(([^)]*)\)s|%%")
+
+
+def compile_template(query):
+    """
+    Split query template into literal parts and parameter names.
+
+    :return: ``(literals, keys)`` with one more literal than keys or ``None``
+             if template contains format directives other than ``%(name)s``
+             and ``%%``.
+    """
+    literals, keys = [], []
+    literal = []
+    pos = 0
+
+    for match in template_re.finditer(query):
+        text = query[pos : match.start()]  # noqa: E203
+        if "%" in text:
+            return None
+        literal.append(text)
+        pos = match.end()
+
+        key = match.group(1)
+        if key is None:
+            literal.append("%")
+        else:
+            literals.append("".join(literal))
+            keys.append(key)
+            literal = []
 
-    for key, value in params.items():
-        escaped[key] = escape_param(value)
+    text = query[pos:]
+    if "%" in text:
+        return None
+    literal.append(text)
+    literals.append("".join(literal))
 
-    return escaped
+    return literals, keys
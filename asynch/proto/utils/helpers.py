@@ -1,7 +1,14 @@
+from array import array
 from itertools import islice, tee
 
 
 def chunks(seq, n):
+    if isinstance(seq, list):
+        # Slicing copies item references in C, no per-item iteration.
+        for i in range(0, len(seq), n):
+            yield seq[i : i + n]  # noqa: E203
+        return
+
     it = iter(seq)
     item = list(islice(it, n))
     while item:
@@ -11,20 +18,19 @@ def chunks(seq, n):
 
 def column_chunks(columns, n):
     for column in columns:
-        if not isinstance(column, (list, tuple)):
+        if not isinstance(column, (list, tuple, array)):
             raise TypeError(
-                "Unsupported column type: {}. list or tuple is expected.".format(type(column))
+                "Unsupported column type: {}. "
+                "list, tuple or array is expected.".format(type(column))
             )
 
-    # create chunk generator for every column
-    g = [chunks(column, n) for column in columns]
-
-    while True:
-        # get next chunk for every column
-        item = [next(column, []) for column in g]
-        if not any(item):
-            break
-        yield item
+    # Columns of unequal length are reported by the block.
+    num_rows = max((len(column) for column in columns), default=0)
+    for i in range(0, num_rows, n):
+        item = [column[i : i + n] for column in columns]  # noqa: E203
+        # Columns may modify their chunk in place while preparing it.
+        # Array slices are copies already and can be written as is.
+        yield [c if isinstance(c, (list, array)) else list(c) for c in item]
 
 
 def pairwise(iterable):
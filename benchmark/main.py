@@ -1,4 +1,5 @@
 import asyncio
+from array import array
 from datetime import date, datetime
 from ipaddress import ip_address
 from time import time
@@ -7,7 +8,7 @@ from uuid import UUID
 import uvloop
 from clickhouse_driver import Client
 
-from asynch import connect
+from asynch import connect, create_pool
 from conftest import CONNECTION_DSN
 
 insert_data = (  # nosec:B104
@@ -21,6 +22,12 @@ insert_data = (  # nosec:B104
     ip_address("0.0.0.0"),  # nosec:B104  # ip address str invest many resources
     ip_address("::"),  # nosec:B104  # ip address str invest many resources
 )
+batch_size = 10000
+# Same rows in columnar form, sent as is without transposing.
+insert_columns = [[value] * batch_size for value in insert_data]
+# Numeric columns as arrays are written without packing items one by one.
+insert_arrays = [array("i", insert_columns[0])] + insert_columns[1:4]
+insert_arrays += [array("f", insert_columns[4])] + insert_columns[5:]
 sql = """INSERT INTO test.asynch(id,decimal,date,datetime,float,uuid,string,ipv4,ipv6) VALUES"""
 
 
@@ -49,42 +56,40 @@ async def init_table():
 
 
 def clickhouse_driver_insert():
+    # Single connection, columnar since the benchmark moved off row inserts,
+    # so counts recorded with rows don't apply.
     client = Client(dsn=CONNECTION_DSN)
     start_time = time()
-    data = []
     count = 0
     while time() - start_time < 10:
-        data.append(insert_data)
-        if len(data) == 10000:
-            client.execute(sql, data)
-            count += 10000
-            print(count)
-            data.clear()
-    if data:
-        client.execute(sql, data)
-        count += len(data)
+        client.execute(sql, insert_columns, columnar=True)
+        count += batch_size
+        print(count)
     print(count)
-    # 1250000
 
 
-async def asynch_insert():
-    conn = await connect(dsn=CONNECTION_DSN)
+async def asynch_insert(workers=4):
+    # Each worker inserts over its own connection, so socket writes overlap.
+    # Count is the total of all workers, compare with clickhouse_driver_insert()
+    # only with workers=1.
+    pool = await create_pool(dsn=CONNECTION_DSN, minsize=workers, maxsize=workers)
     start_time = time()
-    data = []
     count = 0
-    async with conn.cursor() as cursor:
-        while time() - start_time < 10:
-            data.append(insert_data)
-            if len(data) == 10000:
-                await cursor.execute(sql, data)
-                count += 10000
-                print(count)
-                data.clear()
-        if data:
-            await cursor.execute(sql, data)
-            count += len(data)
+
+    async def worker():
+        nonlocal count
+        async with pool.acquire() as conn:
+            async with conn.cursor() as cursor:
+                cursor.set_columnar(True)
+                while time() - start_time < 10:
+                    await cursor.execute(sql, insert_arrays)
+                    count += batch_size
+                    print(count)
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    pool.close()
+    await pool.wait_closed()
     print(count)
-    # 830000
 
 
 if __name__ == "__main__":
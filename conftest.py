@@ -1,6 +1,10 @@
-import os
 import asyncio
+import os
+import sys
 from asyncio.streams import StreamReader
+from datetime import date, datetime
+from ipaddress import IPv4Address, IPv6Address
+from uuid import UUID
 
 import pytest
 
@@ -14,7 +18,7 @@ from asynch.proto.streams.buffered import BufferedReader, BufferedWriter
 
 @pytest.fixture
 def column_options():
-    reader = BufferedReader(StreamReader(), constants.BUFFER_SIZE)
+    reader = BufferedReader(StreamReader(limit=constants.BUFFER_SIZE), constants.BUFFER_SIZE)
     writer = BufferedWriter()
     context = Context()
     context.client_settings = {
@@ -39,18 +43,42 @@ CONNECTION_DSN = os.environ.get(
     )
 )
 
+# Row of test.asynch table, see initialize_tests.
+INSERT_SQL = (
+    "INSERT INTO test.asynch(id,decimal,date,datetime,float,uuid,string,ipv4,ipv6,bool) VALUES"
+)
+# Values are native objects, nothing is parsed from strings on insert.
+ROW_TUPLE = (
+    1,
+    1,
+    date(2020, 8, 8),
+    datetime(2020, 8, 8),
+    1,
+    UUID("59e182c4-545d-4f30-8b32-cefea2d0d5ba"),
+    "1",
+    IPv4Address("0.0.0.0"),
+    IPv6Address("::"),
+    True,
+)
+ROW_DICT = dict(
+    zip(
+        ("id", "decimal", "date", "datetime", "float", "uuid", "string", "ipv4", "ipv6", "bool"),
+        ROW_TUPLE,
+    )
+)
+
 
 @pytest.fixture(scope="session")
 def event_loop():
-    policy = asyncio.get_event_loop_policy()
-    res = policy.new_event_loop()
-    asyncio.set_event_loop(res)
-    res._close = res.close
-    res.close = lambda: None
+    if sys.platform != "win32":
+        import uvloop
 
+        res = uvloop.new_event_loop()
+    else:
+        res = asyncio.get_event_loop_policy().new_event_loop()
+    asyncio.set_event_loop(res)
     yield res
-
-    res._close()
+    res.close()
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -79,13 +107,30 @@ async def initialize_tests():
     await conn.close()
 
 
+@pytest.fixture(scope="session")
+async def session_pool():
+    pool = await asynch.create_pool(dsn=CONNECTION_DSN, minsize=1, maxsize=4)
+    yield pool
+    pool.close()
+    await pool.wait_closed()
+
+
+async def execute_statements(pool, *statements):
+    """
+    Runs DDL statements for fixtures that share a table between tests.
+    """
+    async with pool.acquire() as conn:
+        async with conn.cursor() as cursor:
+            for statement in statements:
+                await cursor.execute(statement)
+
+
 @pytest.fixture(scope="function", autouse=True)
-async def truncate_table():
-    conn = await connect(dsn=CONNECTION_DSN)
-    async with conn.cursor(cursor=DictCursor) as cursor:
-        await cursor.execute("truncate table test.asynch")
+async def truncate_table(session_pool):
+    async with session_pool.acquire() as conn:
+        async with conn.cursor(cursor=DictCursor) as cursor:
+            await cursor.execute("truncate table test.asynch")
     yield
-    await conn.close()
 
 
 @pytest.fixture(scope="function")
@@ -97,10 +142,12 @@ async def pool():
 
 
 @pytest.fixture(scope="function")
-async def conn():
-    conn = await asynch.connect(dsn=CONNECTION_DSN)
-    yield conn
-    await conn.close()
+async def conn(session_pool):
+    async with session_pool.acquire() as conn:
+        yield conn
+        if conn._connection.is_query_executing:
+            # Result left partially consumed, reconnect on next acquire.
+            await conn._connection.disconnect()
 
 
 @pytest.fixture(scope="function")
@@ -1,6 +1,7 @@
 import ssl
 
-from asynch.connection import Connection
+from asynch.connection import Connection, _parse_dsn
+from asynch.proto.connection import _ssl_session_key
 
 HOST = "192.168.15.103"
 PORT = 9000
@@ -18,6 +19,23 @@ def test_dsn():
     assert conn.port == PORT
 
 
+def test_dsn_buffer_options():
+    dsn = (
+        f"clickhouse://{USER}:{PASSWORD}@{HOST}:{PORT}/default"
+        "?send_buffer_size=262144"
+        "&tcp_nodelay=false"
+    )
+    conn = Connection(dsn=dsn)
+    assert conn._connection.send_buffer_size == 262144
+    assert conn._connection.tcp_nodelay is False
+
+
+def test_dsn_is_parsed_once():
+    dsn = f"clickhouses://{USER}:{PASSWORD}@{HOST}:{PORT}/default?ssl_version=PROTOCOL_TLSv1"
+    assert _parse_dsn(dsn) is _parse_dsn(dsn)
+    assert Connection(dsn=dsn)._connection.ssl_options["ssl_version"] == ssl.PROTOCOL_TLSv1
+
+
 def test_secure_dsn():
     dsn = (
         f"clickhouses://{USER}:{PASSWORD}@{HOST}:{PORT}/default"
@@ -88,3 +106,39 @@ def test_secure_connection_check_ssl_context():
     ssl_ctx = conn._connection._get_ssl_context()
     assert ssl_ctx is not None
     assert ssl.OP_NO_TLSv1 in ssl_ctx.options
+
+
+def test_ssl_context_is_cached():
+    options = dict(host=HOST, port=PORT, secure=True, ciphers="AES")
+    conn1 = Connection(**options)
+    conn2 = Connection(**options)
+    ssl_ctx = conn1._connection._get_ssl_context()
+
+    assert ssl_ctx is conn2._connection._get_ssl_context()
+    assert ssl_ctx is not Connection(**options, verify=False)._connection._get_ssl_context()
+
+
+def test_ssl_context_allows_session_tickets():
+    conn = Connection(host=HOST, port=PORT, secure=True)
+    ssl_ctx = conn._connection._get_ssl_context()
+    assert ssl_ctx.options & ssl.OP_NO_TICKET == 0
+
+
+def test_ssl_context_resumes_session_per_host_and_port(mocker):
+    conn = Connection(host=HOST, port=PORT, secure=True)
+    ssl_ctx = conn._connection._get_ssl_context()
+    wrap_bio = mocker.patch.object(ssl.SSLContext, "wrap_bio")
+    session = object()
+
+    def wrap(host, port):
+        token = _ssl_session_key.set((host, port))
+        try:
+            ssl_ctx.wrap_bio(ssl.MemoryBIO(), ssl.MemoryBIO(), server_hostname=host)
+        finally:
+            _ssl_session_key.reset(token)
+        return wrap_bio.call_args[0][-1]
+
+    assert wrap(HOST, PORT) is None
+    ssl_ctx.save_session((HOST, PORT), mocker.Mock(session=session))
+    assert wrap(HOST, PORT) is session
+    assert wrap(HOST, 9440) is None
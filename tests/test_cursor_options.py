@@ -6,6 +6,7 @@ import pytest
 
 from asynch.cursors import DictCursor
 from asynch.errors import ErrorCode, ServerException, TypeMismatchError
+from conftest import INSERT_SQL, ROW_DICT, ROW_TUPLE, execute_statements
 
 
 class Dialect:
@@ -26,83 +27,14 @@ class ExternalTable:
 
 stream_results_test_params = dict(
     argnames="method, data, expected, insert_sql, cursor_type",
-    argvalues=[
-        ["fetchone", None, (1,), None, None],
-        ["fetchall", None, [(1,)], None, None],
-        ["fetchall", None, [{"1": 1}], None, DictCursor],
-        [
-            None,
-            [
-                {
-                    "id": 1,
-                    "decimal": 1,
-                    "date": "2020-08-08",
-                    "datetime": "2020-08-08 00:00:00",
-                    "float": 1,
-                    "uuid": "59e182c4-545d-4f30-8b32-cefea2d0d5ba",
-                    "string": "1",
-                    "ipv4": "0.0.0.0",
-                    "ipv6": "::",
-                    "bool": True,
-                }
-            ],
-            1,
-            "INSERT INTO test.asynch(id,decimal,date,datetime,float,uuid,string,ipv4,ipv6,bool) VALUES",
-            DictCursor,
-        ],
-        [
-            None,
-            [
-                (
-                    1,
-                    1,
-                    "2020-08-08",
-                    "2020-08-08 00:00:00",
-                    1,
-                    "59e182c4-545d-4f30-8b32-cefea2d0d5ba",
-                    "1",
-                    "0.0.0.0",
-                    "::",
-                    True,
-                )
-            ],
-            1,
-            "INSERT INTO test.asynch(id,decimal,date,datetime,float,uuid,string,ipv4,ipv6,bool) VALUES",
-            DictCursor,
-        ],
-        [
-            None,
-            [
-                (
-                    1,
-                    1,
-                    "2020-08-08",
-                    "2020-08-08 00:00:00",
-                    1,
-                    "59e182c4-545d-4f30-8b32-cefea2d0d5ba",
-                    "1",
-                    "0.0.0.0",
-                    "::",
-                    True,
-                ),
-                (
-                    1,
-                    1,
-                    "2020-08-08",
-                    "2020-08-08 00:00:00",
-                    1,
-                    "59e182c4-545d-4f30-8b32-cefea2d0d5ba",
-                    "1",
-                    "0.0.0.0",
-                    "::",
-                    True,
-                ),
-            ],
-            2,
-            "INSERT INTO test.asynch(id,decimal,date,datetime,float,uuid,string,ipv4,ipv6,bool) VALUES",
-            DictCursor,
-        ],
-    ],
+    argvalues=(
+        ("fetchone", None, (1,), None, None),
+        ("fetchall", None, [(1,)], None, None),
+        ("fetchall", None, [{"1": 1}], None, DictCursor),
+        (None, [ROW_DICT], 1, INSERT_SQL, DictCursor),
+        (None, [ROW_TUPLE], 1, INSERT_SQL, DictCursor),
+        (None, [ROW_TUPLE, ROW_TUPLE], 2, INSERT_SQL, DictCursor),
+    ),
     ids=[
         "fetchone",
         "fetchall",
@@ -146,57 +78,57 @@ async def test_set_stream_results_context(conn, method, data, expected, insert_s
 
 settings_test_params = dict(
     argnames="local_param_name, statement, expected, expected_exc_dict, settings",
-    argvalues=[
-        [
+    argvalues=(
+        (
             "settings",
             "SELECT 1",
             dict(strings_encoding="utf-8"),
             None,
             dict(strings_encoding="utf-8"),
-        ],
-        [
+        ),
+        (
             "rv",
             "SELECT name, value, changed FROM system.settings WHERE name = 'max_query_size'",
             [("max_query_size", "142", 1)],
             None,
             dict(max_query_size=142),
-        ],
-        [
+        ),
+        (
             "rv",
             "SELECT name, value, changed FROM system.settings WHERE name = 'totals_auto_threshold'",
             [("totals_auto_threshold", "1.23", 1)],
             None,
             dict(totals_auto_threshold=1.23),
-        ],
-        [
+        ),
+        (
             "rv",
             "SELECT name, value, changed FROM system.settings WHERE name = 'force_index_by_date'",
             [("force_index_by_date", "1", 1)],
             None,
             dict(force_index_by_date=1),
-        ],
-        [
+        ),
+        (
             "rv",
             "SELECT name, value, changed FROM system.settings WHERE name = 'format_csv_delimiter'",
             [("format_csv_delimiter", "d", 1)],
             None,
             dict(format_csv_delimiter="d"),
-        ],
-        [
+        ),
+        (
             "rv",
             "SELECT name, value, changed FROM system.settings WHERE name = 'max_threads'",
             [("max_threads", "100500", 1)],
             None,
             dict(max_threads=100500),
-        ],
-        [
+        ),
+        (
             "rv",
             "SELECT 1",
             [(1,)],
             None,
             dict(unknown_settings=12345),
-        ],
-        [
+        ),
+        (
             "rv",
             "SELECT number FROM system.numbers LIMIT 10",
             None,
@@ -209,15 +141,15 @@ settings_test_params = dict(
                 ],
             ),
             dict(max_result_rows=5),
-        ],
-        [
+        ),
+        (
             "rv",
             "SELECT number FROM system.numbers LIMIT 10",
             [(0,), (1,), (2,), (3,), (4,), (5,), (6,), (7,), (8,), (9,)],
             None,
             dict(max_result_rows=5, result_overflow_mode="break"),
-        ],
-    ],
+        ),
+    ),
     ids=[
         "immutable",
         "int",
@@ -280,10 +212,10 @@ async def test_settings_execution_options(
 
 types_check_test_params = dict(
     argnames="enabled, expected_exc_text",
-    argvalues=[
-        [False, "Repeat query with types_check=True for detailed info"],
-        [True, '-1 for column "x"'],
-    ],
+    argvalues=(
+        (False, "Repeat query with types_check=True for detailed info"),
+        (True, '-1 for column "x"'),
+    ),
     ids=[
         "disabled",
         "enabled",
@@ -291,43 +223,68 @@ types_check_test_params = dict(
 )
 
 
-async def _types_check(cursor, execute):
-    await cursor.execute("DROP TABLE IF EXISTS test.test_types_check")
-    await cursor.execute("CREATE TABLE test.test_types_check (x UInt32) ENGINE=Memory")
+@pytest.fixture(scope="module")
+async def types_check_table(session_pool):
+    # Inserts are expected to fail, the table stays empty.
+    await execute_statements(
+        session_pool,
+        "DROP TABLE IF EXISTS test.test_types_check",
+        "CREATE TABLE test.test_types_check (x UInt32) ENGINE=Memory",
+    )
+    yield "test.test_types_check"
+    await execute_statements(session_pool, "DROP TABLE test.test_types_check")
+
 
+async def _types_check(execute, table):
     try:
-        await execute("INSERT INTO test.test_types_check (x) VALUES", [{"x": -1}])
+        await execute(f"INSERT INTO {table} (x) VALUES", [{"x": -1}])
     except TypeMismatchError as e:
-        await cursor.execute("DROP TABLE test.test_types_check")
         return e
 
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize(**types_check_test_params)
-async def test_set_types_check(conn, enabled, expected_exc_text):
+async def test_set_types_check(conn, types_check_table, enabled, expected_exc_text):
     async with conn.cursor() as cursor:
         cursor.set_types_check(enabled)
-        exc = await _types_check(cursor, cursor.execute)
+        exc = await _types_check(cursor.execute, types_check_table)
 
     assert expected_exc_text in str(exc)
 
 
 @pytest.mark.asyncio
 @pytest.mark.parametrize(**types_check_test_params)
-async def test_types_check_execution_options(conn, enabled, expected_exc_text):
+async def test_types_check_execution_options(conn, types_check_table, enabled, expected_exc_text):
     context = Context(execution_options=dict(types_check=enabled))
 
     async with conn.cursor() as cursor:
         execute = partial(cursor.execute, context=context)
-        exc = await _types_check(cursor, execute)
+        exc = await _types_check(execute, types_check_table)
 
     assert expected_exc_text in str(exc)
 
 
+@pytest.mark.asyncio
+async def test_set_columnar(conn):
+    async with conn.cursor() as cursor:
+        await cursor.execute("DROP TABLE IF EXISTS test.test_columnar")
+        await cursor.execute("CREATE TABLE test.test_columnar (x UInt32, y String) ENGINE=Memory")
+
+        cursor.set_columnar(True)
+        await cursor.execute("INSERT INTO test.test_columnar (x, y) VALUES", [[1, 2], ["a", "b"]])
+        cursor.set_columnar(False)
+
+        await cursor.execute("SELECT * FROM test.test_columnar ORDER BY x")
+        rows = await cursor.fetchall()
+        await cursor.execute("DROP TABLE test.test_columnar")
+
+    assert rows == [(1, "a"), (2, "b")]
+
+
 external_tables_test_params = dict(
     argnames="structure, data, expected, expected_exc",
-    argvalues=[
-        [
+    argvalues=(
+        (
             [("x", "Int32"), ("y", "Array(Int32)")],
             [
                 {"x": 100, "y": [2, 4, 6, 8]},
@@ -335,15 +292,15 @@ external_tables_test_params = dict(
             ],
             [(100, [2, 4, 6, 8]), (500, [1, 3, 5, 7])],
             None,
-        ],
-        [[("x", "Int32")], [], [], None],
-        [
+        ),
+        ([("x", "Int32")], [], [], None),
+        (
             [],
             [],
             None,
             ValueError,
-        ],
-    ],
+        ),
+    ),
     ids=[
         "select",
         "send_empty_table",
@@ -1,7 +1,10 @@
 import pytest
 
+from asynch import connect
 from asynch.cursors import DictCursor
-from asynch.proto import constants
+from asynch.proto.columns import write_column
+from asynch.proto.streams import block
+from conftest import CONNECTION_DSN, INSERT_SQL, ROW_DICT, ROW_TUPLE, execute_statements
 
 
 @pytest.mark.asyncio
@@ -35,81 +38,21 @@ async def test_dict_cursor(conn):
 @pytest.mark.asyncio
 async def test_insert_dict(conn):
     async with conn.cursor(cursor=DictCursor) as cursor:
-        rows = await cursor.execute(
-            """INSERT INTO test.asynch(id,decimal,date,datetime,float,uuid,string,ipv4,ipv6,bool) VALUES""",
-            [
-                {
-                    "id": 1,
-                    "decimal": 1,
-                    "date": "2020-08-08",
-                    "datetime": "2020-08-08 00:00:00",
-                    "float": 1,
-                    "uuid": "59e182c4-545d-4f30-8b32-cefea2d0d5ba",
-                    "string": "1",
-                    "ipv4": "0.0.0.0",
-                    "ipv6": "::",
-                    "bool": True,
-                }
-            ],
-        )
+        rows = await cursor.execute(INSERT_SQL, [ROW_DICT])
         assert rows == 1
 
 
 @pytest.mark.asyncio
 async def test_insert_tuple(conn):
     async with conn.cursor(cursor=DictCursor) as cursor:
-        rows = await cursor.execute(
-            """INSERT INTO test.asynch(id,decimal,date,datetime,float,uuid,string,ipv4,ipv6,bool) VALUES""",
-            [
-                (
-                    1,
-                    1,
-                    "2020-08-08",
-                    "2020-08-08 00:00:00",
-                    1,
-                    "59e182c4-545d-4f30-8b32-cefea2d0d5ba",
-                    "1",
-                    "0.0.0.0",
-                    "::",
-                    True,
-                )
-            ],
-        )
+        rows = await cursor.execute(INSERT_SQL, [ROW_TUPLE])
         assert rows == 1
 
 
 @pytest.mark.asyncio
 async def test_executemany(conn):
     async with conn.cursor(cursor=DictCursor) as cursor:
-        rows = await cursor.executemany(
-            """INSERT INTO test.asynch(id,decimal,date,datetime,float,uuid,string,ipv4,ipv6,bool) VALUES""",
-            [
-                (
-                    1,
-                    1,
-                    "2020-08-08",
-                    "2020-08-08 00:00:00",
-                    1,
-                    "59e182c4-545d-4f30-8b32-cefea2d0d5ba",
-                    "1",
-                    "0.0.0.0",
-                    "::",
-                    True,
-                ),
-                (
-                    1,
-                    1,
-                    "2020-08-08",
-                    "2020-08-08 00:00:00",
-                    1,
-                    "59e182c4-545d-4f30-8b32-cefea2d0d5ba",
-                    "1",
-                    "0.0.0.0",
-                    "::",
-                    True,
-                ),
-            ],
-        )
+        rows = await cursor.executemany(INSERT_SQL, [ROW_TUPLE, ROW_TUPLE])
         assert rows == 2
 
 
@@ -137,9 +80,18 @@ ENGINE = MergeTree
 
 
 @pytest.mark.asyncio
-async def test_insert_buffer_overflow(conn):
-    old_buffer_size = constants.BUFFER_SIZE
-    constants.BUFFER_SIZE = 2**6 + 1
+async def test_insert_buffer_overflow(mocker):
+    # Buffer smaller than a single column, so writers flush mid-block.
+    conn = await connect(dsn=CONNECTION_DSN, send_buffer_size=2**6 + 1)
+    flushed = []
+
+    async def spy_write_column(reader, writer, *args, **kwargs):
+        start = writer.bytes_flushed
+        await write_column(reader, writer, *args, **kwargs)
+        flushed.append(writer.bytes_flushed > start)
+
+    mocker.patch.object(block, "write_column", side_effect=spy_write_column)
+    row = (1, "t" * 100, "t", "t", "t")
 
     async with conn.cursor() as cursor:
         await cursor.execute("DROP TABLE if exists test.test")
@@ -153,10 +105,26 @@ async def test_insert_buffer_overflow(conn):
     `c4` String
 ) ENGINE = MergeTree ORDER BY i"""
         await cursor.execute(create_table_sql)
-        await cursor.execute("INSERT INTO test.test VALUES", [(1, "t", "t", "t", "t")])
-        await cursor.execute("DROP TABLE if exists test.test")
+        try:
+            await cursor.execute("INSERT INTO test.test VALUES", [row])
+            assert any(flushed)
+
+            await cursor.execute("SELECT * FROM test.test")
+            assert await cursor.fetchall() == [row]
+        finally:
+            await cursor.execute("DROP TABLE if exists test.test")
+    await conn.close()
 
-    constants.BUFFER_SIZE = old_buffer_size
+
+@pytest.fixture(scope="module")
+async def iter_table(session_pool):
+    await execute_statements(
+        session_pool,
+        "DROP TABLE IF EXISTS test.cursor_iter",
+        "CREATE TABLE test.cursor_iter (a UInt8) ENGINE=Memory",
+    )
+    yield "test.cursor_iter"
+    await execute_statements(session_pool, "DROP TABLE test.cursor_iter")
 
 
 @pytest.mark.asyncio
@@ -173,15 +141,14 @@ async def test_insert_buffer_overflow(conn):
         "without select",
     ],
 )
-async def test_cursror_iter(conn, size, expected_size, with_select):
+async def test_cursror_iter(conn, iter_table, size, expected_size, with_select):
     async with conn.cursor() as cursor:
-        await cursor.execute("DROP TABLE IF EXISTS test.test")
-        await cursor.execute("CREATE TABLE test.test (a UInt8) ENGINE=Memory")
+        await cursor.execute(f"TRUNCATE TABLE {iter_table}")
 
         data = [(v,) for v in range(size)]
-        await cursor.execute("INSERT INTO test.test (a) VALUES", data)
+        await cursor.execute(f"INSERT INTO {iter_table} (a) VALUES", data)
         if with_select:
-            await cursor.execute("SELECT * FROM test.test")
+            await cursor.execute(f"SELECT * FROM {iter_table}")
 
         index = 0
         async for one in cursor:
@@ -1,3 +1,4 @@
+from array import array
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
 
@@ -280,3 +281,20 @@ async def test_int_column_write_data(column_options, spec, expected):
     await column.write_items(([42 * (1 if spec.startswith("U") else -1)]))
 
     assert len(column.writer.buffer) == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "spec, typecode",
+    [["Int8", "b"], ["Int32", "i"], ["Int64", "q"], ["UInt16", "H"], ["UInt32", "i"]],
+    ids=["int8", "int32", "int64", "uint16", "other kind"],
+)
+async def test_int_column_write_array(column_options, spec, typecode):
+    column = get_column_by_spec(spec, column_options)
+    await column.write_items([1, 2, 127])
+    expected = bytes(column.writer.buffer)
+    column.writer.buffer.clear()
+
+    await column.write_items(array(typecode, [1, 2, 127]))
+
+    assert column.writer.buffer == expected
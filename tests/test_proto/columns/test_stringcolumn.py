@@ -1,3 +1,5 @@
+from asyncio import StreamReader
+
 import pytest
 
 from asynch.proto.columns import get_column_by_spec
@@ -27,3 +29,21 @@ async def test_write_data_items(spec, items, expected_buffer, column_options):
     await column.write_items(items)
 
     assert column.writer.buffer == expected_buffer
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "spec, strings_as_bytes, expected",
+    [
+        ("FixedString(2)", False, ("12", "\x00\x00", "5\x00")),
+        ("FixedString(2)", True, (b"12", b"\x00\x00", b"5\x00")),
+    ],
+)
+async def test_read_fixed_string_items(spec, strings_as_bytes, expected, column_options):
+    context = column_options["context"]
+    context.client_settings = dict(context.client_settings, strings_as_bytes=strings_as_bytes)
+    column_options["reader"].reader = stream_reader = StreamReader()
+    stream_reader.feed_data(b"12\x00\x005\x00")
+    column = get_column_by_spec(spec, column_options)
+
+    assert await column.read_items(3) == expected
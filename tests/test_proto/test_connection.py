@@ -1,10 +1,14 @@
+import asyncio
 import re
 from contextlib import asynccontextmanager
+from datetime import date
 from unittest.mock import patch
+from uuid import UUID
 
 import pytest
 
 from asynch.proto.connection import Connection
+from asynch.proto.streams.transport import ClickHouseProtocol
 from conftest import (
     CONNECTION_DB,
     CONNECTION_HOST,
@@ -43,6 +47,11 @@ async def test_ping(conn: Connection):
     assert await conn.ping() is True
 
 
+@pytest.mark.asyncio
+async def test_ping_not_connected():
+    assert await Connection().ping() is False
+
+
 @pytest.mark.asyncio
 async def test_ping_processing_with_invalid_package_size(conn: Connection):
     with patch.object(
@@ -147,3 +156,93 @@ async def test_watch_zero_limit(conn: Connection) -> None:
     iter = await conn.execute_iter("WATCH lv LIMIT 0")
     async for data in iter:
         assert data == (10, 1)
+
+
+@pytest.mark.parametrize(
+    "query, params, expected",
+    [
+        ("SELECT %(a)s, %(b)s, %(a)s", {"a": 1, "b": "x"}, "SELECT 1, 'x', 1"),
+        ("SELECT %(a)s LIKE '%%x'", {"a": "y", "unused": 1}, "SELECT 'y' LIKE '%x'"),
+        ("SELECT %(a)d", {"a": 1}, "SELECT 1"),
+    ],
+    ids=["repeated", "percent", "fallback"],
+)
+def test_substitute_params(query, params, expected):
+    conn = Connection()
+    assert conn.substitute_params(query, params) == expected
+    assert conn.substitute_params(query, params) == expected
+    assert query in conn._template_cache
+
+
+@pytest.mark.asyncio
+async def test_connect_alt_hosts():
+    conn = Connection(
+        host="127.0.0.1",
+        port=1,
+        alt_hosts=f"{CONNECTION_HOST}:{CONNECTION_PORT}",
+        user=CONNECTION_USER,
+        password=CONNECTION_PASSWORD,
+        database=CONNECTION_DB,
+    )
+    await conn.connect()
+    try:
+        assert conn.connected
+        assert (conn.host, conn.port) == (CONNECTION_HOST, CONNECTION_PORT)
+    finally:
+        await conn.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_open_first_connection_closes_late_attempts(mocker):
+    winner = mocker.Mock(spec=ClickHouseProtocol)
+    loser = mocker.Mock(spec=ClickHouseProtocol)
+
+    async def open_connection(host, port):
+        if host == "winner":
+            return winner
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            # Connected before the cancellation was seen.
+            return loser
+
+    mocker.patch.object(Connection, "_open_connection", side_effect=open_connection)
+    conn = Connection(host="winner", port=9000, alt_hosts="loser:9000")
+
+    assert await conn._open_first_connection() == ("winner", 9000, winner)
+    winner.close.assert_not_called()
+    loser.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_execute_iter_columnar(conn: Connection):
+    result = await conn.execute_iter(
+        "SELECT number FROM system.numbers LIMIT 3",
+        settings={"max_block_size": 2},
+        columnar=True,
+    )
+
+    blocks = [block async for block in result]
+    assert all(len(block) == 1 for block in blocks)
+    assert [value for block in blocks for value in block[0]] == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("columnar", [False, True])
+async def test_insert_block_max_bytes(conn: Connection, mocker, columnar):
+    conn.client_settings["insert_block_max_bytes"] = 1024
+    send_serialized_block = mocker.spy(Connection, "send_serialized_block")
+    rows = [
+        (i, None if i % 2 else i, UUID(int=i), date(2020, 1, 1 + i % 28), "x" * 100)
+        for i in range(50)
+    ]
+    data = [list(column) for column in zip(*rows)] if columnar else rows
+
+    spec = "a Int32, b Nullable(Int32), c UUID, d Date, e String"
+    async with create_table(conn, spec):
+        await conn.execute("INSERT INTO test.test VALUES", data, columnar=columnar)
+
+        blocks = [call.args[1] for call in send_serialized_block.call_args_list]
+        assert len(blocks) > 1
+        assert all(len(block) <= 1024 for block in blocks)
+        assert await conn.execute("SELECT * FROM test.test ORDER BY a") == rows
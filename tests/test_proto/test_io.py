@@ -3,7 +3,14 @@ from unittest.mock import AsyncMock
 
 import pytest
 
-from asynch.proto.streams.buffered import BufferedReader, BufferedWriter
+from asynch.errors import TooLargeStringSize
+from asynch.proto.streams.buffered import (
+    BufferedReader,
+    BufferedWriter,
+    CompressedBufferedWriter,
+    WRITE_THROUGH_SIZE,
+)
+from asynch.proto.streams.transport import ClickHouseProtocol
 
 
 @pytest.mark.asyncio
@@ -19,6 +26,67 @@ async def test_BufferedReader_overflow():
     assert result == stream_data
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("buffer_size", [1, 3, 1024])
+async def test_BufferedReader_read_bytes(buffer_size):
+    stream_reader = StreamReader()
+    stream_reader.feed_data(b"12345678")
+    reader = BufferedReader(stream_reader, buffer_size)
+
+    assert await reader.read_bytes(1) == b"1"
+    assert await reader.read_bytes(6) == b"234567"
+    assert await reader.read_bytes(1) == b"8"
+
+
+@pytest.mark.asyncio
+async def test_BufferedReader_read_bytes_eof():
+    stream_reader = StreamReader()
+    stream_reader.feed_data(b"12")
+    stream_reader.feed_eof()
+    reader = BufferedReader(stream_reader, 1)
+
+    with pytest.raises(EOFError):
+        await reader.read_bytes(4)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("buffer_size", [1, 3, 1024])
+async def test_BufferedReader_read_strings(buffer_size):
+    stream_reader = StreamReader()
+    stream_reader.feed_data(b"\x011\x00\x0212\x83\x01" + b"x" * 131)
+    reader = BufferedReader(stream_reader, buffer_size)
+
+    result = await reader.read_strings(4)
+
+    assert result == ["1", "", "12", "x" * 131]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("buffer_size", [1, 3, 1024])
+async def test_BufferedReader_read_varints(buffer_size):
+    stream_reader = StreamReader()
+    stream_reader.feed_data(b"\x00\x7f\x80\x01\xbc\xa9\x03\x05")
+    reader = BufferedReader(stream_reader, buffer_size)
+
+    result = await reader.read_varints(4)
+
+    assert result == [0, 127, 128, 54460]
+    assert await reader.read_varint() == 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("buffer_size", [1, 3, 1024])
+async def test_BufferedReader_skip_str(buffer_size):
+    stream_reader = StreamReader()
+    stream_reader.feed_data(b"\x83\x01" + b"x" * 131 + b"\x0212")
+    reader = BufferedReader(stream_reader, buffer_size)
+
+    await reader.skip_str()
+    result = await reader.read_str()
+
+    assert result == "12"
+
+
 @pytest.mark.asyncio
 async def test_BufferedWriter_overflow(mocker):
     writer = mocker.Mock()
@@ -33,6 +101,127 @@ async def test_BufferedWriter_overflow(mocker):
     assert len(b_writer.buffer) == 0
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("value", [0, 1, 127, 128, 300, 54460, (1 << 64) - 1])
+async def test_BufferedWriter_write_varint(mocker, value):
+    writer = mocker.Mock()
+    writer.drain = AsyncMock()
+    b_writer = BufferedWriter(writer, 1024)
+
+    await b_writer.write_varint(value)
+
+    stream_reader = StreamReader()
+    stream_reader.feed_data(bytes(b_writer.buffer))
+    assert await BufferedReader(stream_reader).read_varint() == value
+    assert b_writer.position == len(b_writer.buffer)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("pending, reused", [(0, True), (4, False)])
+async def test_BufferedWriter_flush_reuses_buffer(mocker, pending, reused):
+    protocol = ClickHouseProtocol()
+    protocol.connection_made(mocker.Mock())
+    protocol.transport.is_closing.return_value = False
+    protocol.transport.get_write_buffer_size.return_value = pending
+    written = bytearray()
+    protocol.transport.write.side_effect = written.extend
+    b_writer = BufferedWriter(protocol, 1024)
+    buffer = b_writer.buffer
+
+    await b_writer.write_bytes(b"1234")
+    await b_writer.flush()
+
+    assert written == b"1234"
+    assert (b_writer.buffer is buffer) == reused
+    assert len(b_writer.buffer) == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("value, expected", [(-1, b"\x7f"), (-64, b"\x40"), (-129, b"\xff\x7e")])
+async def test_BufferedWriter_write_negative_varint(mocker, value, expected):
+    b_writer = BufferedWriter(mocker.Mock(), 1024)
+
+    await b_writer.write_varint(value)
+
+    assert b_writer.buffer == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "fmt, value, expected",
+    [("b", -1, b"\xff"), ("H", 300, b"\x2c\x01"), ("q", -2, b"\xfe" + b"\xff" * 7)],
+)
+async def test_BufferedWriter_write_int(mocker, fmt, value, expected):
+    b_writer = BufferedWriter(mocker.Mock(), 1024)
+
+    await b_writer.write_int(value, fmt)
+
+    assert b_writer.buffer == expected
+    assert b_writer.position == len(expected)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("buffer_size", [1, 1024])
+async def test_BufferedWriter_write_strings(mocker, buffer_size):
+    writer = mocker.Mock()
+    writer.drain = AsyncMock()
+    written = bytearray()
+    writer.write.side_effect = written.extend
+    b_writer = BufferedWriter(writer, buffer_size)
+
+    await b_writer.write_strings(["1", "", b"12", "x" * 131])
+    await b_writer.flush()
+
+    assert written == b"\x011\x00\x0212\x83\x01" + b"x" * 131
+
+
+@pytest.mark.asyncio
+async def test_BufferedWriter_write_through(mocker):
+    writer = mocker.Mock()
+    writer.drain = AsyncMock()
+    b_writer = BufferedWriter(writer, 1 << 20)
+    payload = b"x" * WRITE_THROUGH_SIZE
+
+    await b_writer.write_bytes(b"12")
+    await b_writer.write_bytes(payload)
+    await b_writer.write_bytes(b"3")
+    await b_writer.flush()
+
+    (segments,), _ = writer.writelines.call_args
+    assert segments == [b"12", payload, b"3"]
+    assert segments[1] is payload
+    assert b_writer.tell() == WRITE_THROUGH_SIZE + 3
+    writer.write.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_BufferedWriter_write_through_copies_mutable(mocker):
+    writer = mocker.Mock()
+    writer.drain = AsyncMock()
+    b_writer = BufferedWriter(writer, 1 << 20)
+    payload = bytearray(WRITE_THROUGH_SIZE)
+
+    await b_writer.write_bytes(memoryview(payload))
+    payload[0] = 1
+    payload.append(0)
+
+    assert b_writer.segments == []
+    assert b_writer.buffer == bytes(WRITE_THROUGH_SIZE)
+
+
+@pytest.mark.asyncio
+async def test_CompressedBufferedWriter_overflow(mocker):
+    compressor = mocker.Mock()
+    compressor.write = AsyncMock()
+    b_writer = CompressedBufferedWriter(compressor, None, 2)
+
+    await b_writer.write_bytes(b"12")
+    await b_writer.write_bytes(b"3")
+    await b_writer.flush()
+
+    assert compressor.write.await_args_list == [mocker.call(b"12"), mocker.call(b"3")]
+
+
 @pytest.mark.asyncio
 async def test_ByfferedWriter_write_fixed_strings(mocker):
     writer = mocker.Mock()
@@ -43,3 +232,46 @@ async def test_ByfferedWriter_write_fixed_strings(mocker):
     await b_writer.write_fixed_strings(["", "12", b"12"], 2)
 
     assert b_writer.buffer == b"\x00\x001212"
+
+
+@pytest.mark.asyncio
+async def test_BufferedWriter_write_fixed_strings_too_large(mocker):
+    b_writer = BufferedWriter(mocker.Mock(), 1024)
+
+    with pytest.raises(TooLargeStringSize):
+        await b_writer.write_fixed_strings(["1", "123"], 2)
+
+
+@pytest.mark.asyncio
+async def test_ClickHouseProtocol_read(mocker):
+    protocol = ClickHouseProtocol(4)
+    protocol.connection_made(mocker.Mock())
+
+    for chunk in (b"1234", b"5678"):
+        buffer = protocol.get_buffer(-1)
+        buffer[: len(chunk)] = chunk
+        protocol.buffer_updated(len(chunk))
+    protocol.eof_received()
+
+    reader = BufferedReader(protocol, 3)
+    assert await reader.read_bytes(8) == b"12345678"
+    assert await protocol.read(1) == b""
+    protocol.transport.pause_reading.assert_called()
+    protocol.transport.resume_reading.assert_called()
+
+
+@pytest.mark.asyncio
+async def test_ClickHouseProtocol_read_into(mocker):
+    protocol = ClickHouseProtocol(8)
+    protocol.connection_made(mocker.Mock())
+
+    buffer = protocol.get_buffer(-1)
+    buffer[:6] = b"123456"
+    protocol.buffer_updated(6)
+    protocol.eof_received()
+
+    packet = bytearray(b"0")
+    assert await protocol.read_into(packet, 4) == 4
+    assert await protocol.read() == b"56"
+    assert await protocol.read_into(packet) == 0
+    assert packet == b"01234"